@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel
@@ -25,6 +26,11 @@ class Settings(BaseModel):
     azure_search_use_semantic: bool = True
     azure_search_auto_create_index: bool = True
     minimum_relevance_score: float = 0.7
+    embedding_hedge_seconds: float = 1.0
+    semantic_cache_threshold: float = 1.01
+    hnsw_m: int = 8
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 100
     enable_streaming: bool = True
     allowed_origins: List[str] = ["*"]
 
@@ -98,13 +104,23 @@ def _read_config() -> Dict[str, object]:
         "minimum_relevance_score": _parse_float(
             _read_value("MINIMUM_RELEVANCE_SCORE"), 0.7
         ),
+        "embedding_hedge_seconds": _parse_float(
+            _read_value("EMBEDDING_HEDGE_SECONDS"), 1.0
+        ),
+        "semantic_cache_threshold": _parse_float(
+            _read_value("SEMANTIC_CACHE_THRESHOLD"), 1.01
+        ),
+        "hnsw_m": _parse_int(_read_value("HNSW_M"), 8),
+        "hnsw_ef_construction": _parse_int(_read_value("HNSW_EF_CONSTRUCTION"), 200),
+        "hnsw_ef_search": _parse_int(_read_value("HNSW_EF_SEARCH"), 100),
         "enable_streaming": _parse_bool(_read_value("ENABLE_STREAMING"), default=True),
         "allowed_origins": _parse_allowed_origins(_read_value("ALLOWED_ORIGINS")),
     }
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Build a Settings object from hardcoded credentials."""
+    """Build a Settings object from hardcoded credentials (cached after first call)."""
 
     values = _read_config()
     required_keys: List[str] = [
@@ -121,8 +137,6 @@ def get_settings() -> Settings:
     if missing:
         missing_list = ", ".join(missing)
         raise ValueError(f"Missing required hardcoded credentials: {missing_list}")
-    return Settings(**values)
-
-
-# Instantiate settings once for reuse across the app.
-settings = get_settings()
+    # Values are already parsed above, so skip validation; the required-key check
+    # is the only guard. Call get_settings.cache_clear() to reload in tests.
+    return Settings.model_construct(**values)
@@ -1,15 +1,39 @@
 """FastAPI application entry point."""
 
+import random
 import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
-from app.config.config import settings
+from app.config.config import get_settings
 from app.routes.chat_routes import router as chat_router
+from app.utils.file_processor import close_form_recognizer
+from app.utils.logging import get_logger
+from app.utils.responses import ORJSONResponse
+
+logger = get_logger(__name__)
+
+# Health checks are polled constantly; log only a sample of them.
+HEALTH_PATH = "/api/health"
+HEALTH_LOG_SAMPLE_RATE = 0.01
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Release shared SDK clients when the application shuts down."""
+
+    yield
+    await close_form_recognizer()
+
 
 # Create the FastAPI application instance.
-app = FastAPI(title="RAG Chatbot API")
+app = FastAPI(
+    title="RAG Chatbot API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Simple request logging middleware with latency tracking.
 @app.middleware("http")
@@ -17,20 +41,31 @@ async def log_requests(request: Request, call_next):
     start_time = time.perf_counter()
     response = await call_next(request)
     duration_ms = int((time.perf_counter() - start_time) * 1000)
-    print(f"{request.method} {request.url.path} {duration_ms}ms")
+    request.state.duration_ms = duration_ms
+    path = request.url.path
+    if path == HEALTH_PATH and random.random() > HEALTH_LOG_SAMPLE_RATE:
+        return response
+    logger.info(
+        "%s %s %sms",
+        request.method,
+        path,
+        duration_ms,
+        extra={"method": request.method, "path": path, "duration_ms": duration_ms},
+    )
     return response
 
 
 # Global exception handler for unexpected errors.
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(_request: Request, exc: Exception):
-    return JSONResponse(status_code=500, content={"detail": str(exc)})
+    return ORJSONResponse(status_code=500, content={"detail": str(exc)})
 
 # Enable CORS for local development; restrict origins in production.
+allowed_origins = get_settings().allowed_origins
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.allowed_origins,
-    allow_credentials=settings.allowed_origins != ["*"],
+    allow_origins=allowed_origins,
+    allow_credentials=allowed_origins != ["*"],
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
+import msgspec
 from pydantic import BaseModel, Field
 
 
@@ -69,3 +70,46 @@ class ChatResponse(BaseModel):
     suggested_actions: Optional[List[str]] = Field(
         default=None, description="Suggested actions when context is insufficient."
     )
+
+
+# msgspec mirrors of the chat schemas. The chat routes decode and encode with these
+# on the hot path; the Pydantic models above stay as the OpenAPI documentation.
+# Trust boundary: request bodies are validated when decoded, while response
+# structs are built from our own search results and are not re-validated.
+
+
+class ChatMessageBody(msgspec.Struct):
+    """Chat history message decoded by msgspec."""
+
+    role: str
+    content: str
+
+
+class ChatRequestBody(msgspec.Struct):
+    """Chat request payload decoded by msgspec."""
+
+    message: str
+    history: Optional[List[ChatMessageBody]] = None
+    top_k: Optional[int] = 5
+    temperature: Optional[float] = 0.2
+    max_tokens: Optional[int] = 512
+
+
+class SourceDocumentBody(msgspec.Struct):
+    """Source document encoded by msgspec."""
+
+    id: str
+    title: str
+    relevance_score: float
+    excerpt: str
+    metadata: Dict[str, Any] = {}
+
+
+class ChatResponseBody(msgspec.Struct):
+    """Chat response payload encoded by msgspec."""
+
+    answer: str
+    sources: List[SourceDocumentBody] = []
+    has_sufficient_context: bool = True
+    tokens_used: int = 0
+    suggested_actions: Optional[List[str]] = None
@@ -2,25 +2,37 @@
 
 from __future__ import annotations
 
+import asyncio
+import re
+import tempfile
 import time
 import uuid
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
-from fastapi.responses import JSONResponse
+import msgspec
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
 from sse_starlette.sse import EventSourceResponse
 
-from app.models.schemas import ChatRequest, ChatResponse
-from app.services.openai_service import AzureOpenAIService
+from app.models.schemas import (
+    ChatRequest,
+    ChatRequestBody,
+    ChatResponse,
+    ChatResponseBody,
+    SourceDocumentBody,
+)
+from app.services.openai_service import get_openai_service
 from app.services.rag_service import RAGService
 from app.services.search_service import (
     AzureSearchService,
     IndexConfigurationError,
     SearchServiceUnavailableError,
 )
-from app.config.config import settings
+from app.config.config import get_settings
 from app.utils.logging import get_logger
 from app.utils.file_processor import (
+    FileData,
     chunk_text_with_metadata,
     FormRecognizerConfigError,
     FormRecognizerServiceError,
@@ -29,12 +41,13 @@ from app.utils.file_processor import (
     extract_text_from_pdf,
     extract_text_from_txt,
 )
-from app.utils.prompt_templates import STRICT_RAG_SYSTEM_PROMPT
+from app.utils.prompt_templates import render_strict_prompt
+from app.utils.responses import ORJSONResponse
 
 logger = get_logger(__name__)
 
 router = APIRouter()
-openai_service = AzureOpenAIService()
+openai_service = get_openai_service()
 search_service = AzureSearchService()
 rag_service = RAGService(
     search_service=search_service,
@@ -42,10 +55,100 @@ rag_service = RAGService(
 )
 
 MAX_UPLOAD_BYTES = 50 * 1024 * 1024
-SUPPORTED_EXTENSIONS = {".pdf", ".txt", ".docx"}
+UPLOAD_READ_CHUNK_BYTES = 1 << 20
+# Uploads larger than this spill from memory to a temporary file on disk.
+UPLOAD_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+EMBEDDING_BATCH_SIZE = 16
+# Cap concurrent embedding requests to stay within Azure OpenAI rate limits.
+EMBEDDING_MAX_CONCURRENCY = 4
+
+
+def _sync_extractor(extract: Callable[[FileData], str]) -> Callable[[FileData], Awaitable[str]]:
+    """Run a synchronous text extractor in a worker thread off the event loop."""
+
+    async def run(file_data: FileData) -> str:
+        return await asyncio.to_thread(extract, file_data)
+
+    return run
+
+
+# Extension -> text extractor, resolved with a single dict lookup per upload.
+EXTRACTORS: Dict[str, Callable[[FileData], Awaitable[str]]] = {
+    ".pdf": extract_text_from_pdf,
+    ".docx": _sync_extractor(extract_text_from_docx),
+    ".txt": _sync_extractor(extract_text_from_txt),
+}
+SUPPORTED_EXTENSIONS = frozenset(EXTRACTORS)
+
+_chat_request_decoder = msgspec.json.Decoder(ChatRequestBody, strict=False)
+_json_encoder = msgspec.json.Encoder()
+
+# msgspec reports the failing location as a trailing "- at `$.field[0]`".
+_RE_ERROR_PATH = re.compile(r"^(?P<msg>.*?)(?: - at `\$(?P<path>[^`]*)`)?$", re.DOTALL)
+_RE_PATH_PART = re.compile(r"\.([^.\[]+)|\[(\d+)\]")
+_RE_MISSING_FIELD = re.compile(r"^Object missing required field `([^`]+)`$")
+
+
+def _inline_schema_refs(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Inline local $defs references so the schema can be embedded in OpenAPI."""
+
+    definitions = schema.pop("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#/$defs/"):
+                return resolve(definitions[ref.rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
+
+    return resolve(schema)
+
+
+# Chat bodies are decoded by msgspec, so document the Pydantic schema explicitly.
+CHAT_REQUEST_OPENAPI: Dict[str, Any] = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": _inline_schema_refs(ChatRequest.model_json_schema())
+            }
+        },
+    }
+}
+
+
+async def _decode_chat_request(http_request: Request) -> ChatRequestBody:
+    """Decode and validate the chat payload with msgspec instead of Pydantic."""
+
+    body = await http_request.body()
+    try:
+        return _chat_request_decoder.decode(body)
+    except msgspec.DecodeError as exc:
+        raise RequestValidationError(_validation_errors(exc), body=body) from exc
+
+
+def _validation_errors(exc: msgspec.DecodeError) -> List[Dict[str, Any]]:
+    """Translate a msgspec decode error into FastAPI's 422 error list."""
+
+    if not isinstance(exc, msgspec.ValidationError):
+        return [{"type": "json_invalid", "loc": ["body"], "msg": "JSON decode error"}]
+
+    match = _RE_ERROR_PATH.match(str(exc))
+    message = match.group("msg")
+    loc: List[Union[str, int]] = ["body"]
+    for name, index in _RE_PATH_PART.findall(match.group("path") or ""):
+        loc.append(name if name else int(index))
+    missing = _RE_MISSING_FIELD.match(message)
+    if missing:
+        loc.append(missing.group(1))
+        return [{"type": "missing", "loc": loc, "msg": "Field required"}]
+    return [{"type": "value_error", "loc": loc, "msg": message}]
 
 
-def _chat_options(request: ChatRequest) -> Dict[str, Any]:
+def _chat_options(request: ChatRequestBody) -> Dict[str, Any]:
     """Build shared chat options for stream and non-stream calls."""
 
     return {
@@ -56,14 +159,31 @@ def _chat_options(request: ChatRequest) -> Dict[str, Any]:
     }
 
 
-async def _generate_fallback_answer(request: ChatRequest) -> str:
+async def _embed_chunks(chunks: List[str]) -> List[List[float]]:
+    """Embed chunks in sub-batches issued concurrently with bounded parallelism."""
+
+    semaphore = asyncio.Semaphore(EMBEDDING_MAX_CONCURRENCY)
+
+    async def embed_batch(batch: List[str]) -> List[List[float]]:
+        async with semaphore:
+            return await openai_service.generate_embeddings_batch(batch)
+
+    batches = [
+        chunks[start : start + EMBEDDING_BATCH_SIZE]
+        for start in range(0, len(chunks), EMBEDDING_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+    return [vector for batch_vectors in results for vector in batch_vectors]
+
+
+async def _generate_fallback_answer(request: ChatRequestBody) -> str:
     """Generate a complete non-stream response for SSE fallback."""
 
     result = await rag_service.process_query(**_chat_options(request))
     return str(result.get("answer") or "")
 
 
-async def _safe_fallback_answer(request: ChatRequest) -> str | None:
+async def _safe_fallback_answer(request: ChatRequestBody) -> str | None:
     """Best-effort fallback that never raises inside the SSE generator."""
 
     try:
@@ -73,19 +193,21 @@ async def _safe_fallback_answer(request: ChatRequest) -> str | None:
         return None
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest) -> ChatResponse:
+@router.post("/chat", response_model=ChatResponse, openapi_extra=CHAT_REQUEST_OPENAPI)
+async def chat(request: ChatRequestBody = Depends(_decode_chat_request)) -> Response:
     """Process chat query through the RAG pipeline."""
 
     try:
         result = await rag_service.process_query(**_chat_options(request))
-        return ChatResponse(
+        # Result fields come from our own RAG pipeline; msgspec structs skip validation.
+        response = ChatResponseBody(
             answer=result["answer"],
-            sources=result["sources"],
+            sources=[SourceDocumentBody(**item) for item in result["sources"]],
             has_sufficient_context=result.get("has_sufficient_context", True),
             tokens_used=result.get("tokens_used", 0),
             suggested_actions=result.get("suggested_actions"),
         )
+        return Response(content=_json_encoder.encode(response), media_type="application/json")
     except SearchServiceUnavailableError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
     except IndexConfigurationError as exc:
@@ -95,14 +217,16 @@ async def chat(request: ChatRequest) -> ChatResponse:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
-@router.post("/chat/stream")
-async def chat_stream(request: ChatRequest) -> EventSourceResponse:
+@router.post("/chat/stream", openapi_extra=CHAT_REQUEST_OPENAPI)
+async def chat_stream(
+    request: ChatRequestBody = Depends(_decode_chat_request),
+) -> EventSourceResponse:
     """Stream chat responses via server-sent events."""
     # Compatibility endpoint: primary production rendering should use /api/chat
     # so responses always pass backend normalization and source-footer enforcement.
 
     async def event_generator():
-        if not settings.enable_streaming:
+        if not get_settings().enable_streaming:
             fallback_answer = await _safe_fallback_answer(request)
             if fallback_answer is not None:
                 yield {"data": fallback_answer}
@@ -122,9 +246,7 @@ async def chat_stream(request: ChatRequest) -> EventSourceResponse:
 
             context_documents = context_result.get("context_documents", [])
             context = rag_service.format_context(context_documents)
-            strict_prompt = STRICT_RAG_SYSTEM_PROMPT.format(
-                context=context, question=request.message
-            )
+            strict_prompt = render_strict_prompt(context, request.message)
 
             streamed_any = False
             async for chunk in openai_service.chat_completion_stream(
@@ -162,31 +284,34 @@ async def chat_stream(request: ChatRequest) -> EventSourceResponse:
 
 
 @router.post("/documents/upload")
-async def upload_document(file: UploadFile = File(...)) -> JSONResponse:
+async def upload_document(file: UploadFile = File(...)) -> ORJSONResponse:
     """Upload a document, chunk it, and store embeddings in Azure Search."""
 
     filename = file.filename or ""
-    extension = "." + filename.split(".")[-1].lower() if "." in filename else ""
-    if extension not in SUPPORTED_EXTENSIONS:
+    _, dot, suffix = filename.rpartition(".")
+    extension = "." + suffix.lower() if dot else ""
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
         raise HTTPException(status_code=400, detail="Unsupported file type")
 
-    file_bytes = await file.read()
-    if len(file_bytes) > MAX_UPLOAD_BYTES:
-        raise HTTPException(status_code=413, detail="File too large")
+    with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY) as spool:
+        # Read in chunks so oversized uploads are rejected without buffering them whole.
+        total_bytes = 0
+        while chunk := await file.read(UPLOAD_READ_CHUNK_BYTES):
+            total_bytes += len(chunk)
+            if total_bytes > MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="File too large")
+            spool.write(chunk)
+        spool.seek(0)
 
-    if extension == ".pdf":
         try:
-            text = await extract_text_from_pdf(file_bytes)
+            text = await extractor(spool)
         except FormRecognizerConfigError as exc:
             raise HTTPException(status_code=503, detail=str(exc)) from exc
         except FormRecognizerServiceError as exc:
             raise HTTPException(status_code=502, detail=str(exc)) from exc
         except PDFExtractionError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
-    elif extension == ".docx":
-        text = extract_text_from_docx(file_bytes)
-    else:
-        text = extract_text_from_txt(file_bytes)
 
     if not text.strip():
         raise HTTPException(status_code=400, detail="No text extracted from file")
@@ -196,7 +321,7 @@ async def upload_document(file: UploadFile = File(...)) -> JSONResponse:
     if not chunks:
         raise HTTPException(status_code=400, detail="No content to index")
 
-    embeddings = await openai_service.generate_embeddings_batch(chunks)
+    embeddings = await _embed_chunks(chunks)
 
     parent_id = str(uuid.uuid4())
     documents: List[Dict[str, Any]] = []
@@ -215,8 +340,11 @@ async def upload_document(file: UploadFile = File(...)) -> JSONResponse:
 
         documents.append(
             {
-                "id": str(uuid.uuid4()),
+                # Chunk keys only need to be unique within the parent upload.
+                "id": f"{parent_id}-{idx:06d}",
                 "title": filename,
+                "parent_id": parent_id,
+                "chunk_index": idx,
                 "content": chunk,
                 "metadata": metadata,
                 "embedding": embeddings[idx],
@@ -230,7 +358,7 @@ async def upload_document(file: UploadFile = File(...)) -> JSONResponse:
     except IndexConfigurationError as exc:
         raise HTTPException(status_code=409, detail=str(exc)) from exc
 
-    return JSONResponse(
+    return ORJSONResponse(
         {
             "message": "Document uploaded",
             "document_count": len(documents),
@@ -242,15 +370,62 @@ async def upload_document(file: UploadFile = File(...)) -> JSONResponse:
     )
 
 
+async def _documents_from_facets() -> Tuple[List[Dict[str, Any]] | None, int]:
+    """Build the per-file listing from parent_id facets when they cover the index."""
+
+    facet_stats = await search_service.parent_facets()
+    if facet_stats is None:
+        # The index has no parent_id field, so only the full scan can group chunks.
+        return None, 0
+    parents = facet_stats["parents"]
+    total_count = facet_stats["total_count"]
+    if sum(parent["chunk_count"] for parent in parents) != total_count:
+        # Older chunks without a top-level parent_id need the full scan to group.
+        return None, total_count
+
+    documents = [
+        {
+            "id": parent["id"],
+            "title": parent["title"] or "Document",
+            "metadata": {"chunk_count": parent["chunk_count"]},
+        }
+        for parent in parents
+    ]
+    return documents, total_count
+
+
+def _group_documents(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group chunk search results into one entry per uploaded file."""
+
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for doc in results:
+        metadata = doc.get("metadata") or {}
+        parent_id = metadata.get("parent_id") or metadata.get("filename") or doc.get("id")
+        title = metadata.get("filename") or doc.get("title") or "Document"
+        if parent_id not in grouped:
+            grouped[parent_id] = {
+                "id": parent_id,
+                "title": title,
+                "metadata": {"chunk_count": 0},
+            }
+        grouped[parent_id]["metadata"]["chunk_count"] += 1
+    return list(grouped.values())
+
+
 @router.get("/documents")
-async def list_documents(top: int | None = None) -> JSONResponse:
+async def list_documents(top: int | None = None) -> ORJSONResponse:
     """List documents in the Azure Search index."""
 
+    documents: List[Dict[str, Any]] | None = None
+    results: List[Dict[str, Any]] = []
+    faceted_chunk_count = 0
     try:
         stats = await search_service.get_index_stats()
         indexed_chunk_count = int(stats.get("document_count") or 0)
         if top is None:
-            results = await search_service.list_all_documents()
+            documents, faceted_chunk_count = await _documents_from_facets()
+            if documents is None:
+                results = await search_service.list_all_documents()
         else:
             results = await search_service.hybrid_search(
                 query_text="*", query_embedding=None, top_k=top
@@ -260,22 +435,10 @@ async def list_documents(top: int | None = None) -> JSONResponse:
     except IndexConfigurationError as exc:
         raise HTTPException(status_code=409, detail=str(exc)) from exc
 
-    grouped: Dict[str, Dict[str, Any]] = {}
-    for doc in results:
-        metadata = doc.get("metadata") or {}
-        parent_id = metadata.get("parent_id") or metadata.get("filename") or doc.get("id")
-        title = metadata.get("filename") or doc.get("title") or "Document"
-        if parent_id not in grouped:
-            grouped[parent_id] = {
-                "id": parent_id,
-                "title": title,
-                "metadata": {"chunk_count": 0},
-            }
-        grouped[parent_id]["metadata"]["chunk_count"] += 1
-
-    documents = list(grouped.values())
-    chunk_count = indexed_chunk_count or len(results)
-    return JSONResponse(
+    if documents is None:
+        documents = _group_documents(results)
+    chunk_count = indexed_chunk_count or faceted_chunk_count or len(results)
+    return ORJSONResponse(
         {
             "documents": documents,
             "count": len(documents),
@@ -286,20 +449,11 @@ async def list_documents(top: int | None = None) -> JSONResponse:
 
 
 @router.delete("/documents/{document_id}")
-async def delete_document(document_id: str) -> JSONResponse:
+async def delete_document(document_id: str) -> ORJSONResponse:
     """Delete a document by ID."""
 
     try:
-        results = await search_service.hybrid_search(
-            query_text="*", query_embedding=None, top_k=1000
-        )
-        chunk_ids = []
-        for doc in results:
-            metadata = doc.get("metadata") or {}
-            if metadata.get("parent_id") == document_id:
-                if doc.get("id"):
-                    chunk_ids.append(doc["id"])
-
+        chunk_ids = await search_service.find_ids_by_parent(document_id)
         if chunk_ids:
             await search_service.delete_documents(chunk_ids)
         else:
@@ -310,11 +464,12 @@ async def delete_document(document_id: str) -> JSONResponse:
     except IndexConfigurationError as exc:
         raise HTTPException(status_code=409, detail=str(exc)) from exc
 
-    return JSONResponse({"message": "Document deleted", "document_id": document_id})
+    rag_service.invalidate_for_doc_id(document_id)
+    return ORJSONResponse({"message": "Document deleted", "document_id": document_id})
 
 
 @router.get("/health")
-async def health() -> JSONResponse:
+async def health() -> ORJSONResponse:
     """Check service connectivity and return latency metrics."""
 
     status: Dict[str, Any] = {"status": "ok"}
@@ -337,4 +492,4 @@ async def health() -> JSONResponse:
         status["azure_openai"] = f"error: {exc}"
     status["azure_openai_latency_ms"] = int((time.perf_counter() - openai_start) * 1000)
 
-    return JSONResponse(status)
+    return ORJSONResponse(status)
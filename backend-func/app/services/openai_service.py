@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
+import logging
+from functools import lru_cache
+from itertools import chain
 from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
+import httpx2
 import tiktoken
-from openai import APIError, APITimeoutError, AsyncAzureOpenAI, RateLimitError
+from openai import (
+    APIError,
+    APITimeoutError,
+    AsyncAzureOpenAI,
+    DefaultAsyncHttpxClient,
+    RateLimitError,
+)
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -13,24 +23,53 @@ from tenacity import (
     wait_exponential_jitter,
 )
 
-from app.config.config import settings
+from app.config.config import get_settings
 from app.utils.prompt_templates import SYSTEM_PROMPT
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Texts longer than this are counted directly so the token cache stays small.
+TOKEN_CACHE_MAX_TEXT_LENGTH = 4096
+
+# Connection pool shared by every Azure OpenAI call in the process.
+OPENAI_HTTP_LIMITS = httpx2.Limits(max_connections=100, max_keepalive_connections=50)
+OPENAI_HTTP_TIMEOUT = httpx2.Timeout(30.0)
+
+
+@lru_cache(maxsize=1)
+def _cl100k() -> tiktoken.Encoding:
+    """Return the shared cl100k_base encoding used for token counting."""
+
+    return tiktoken.get_encoding("cl100k_base")
+
+
+@lru_cache(maxsize=1)
+def _shared_client() -> AsyncAzureOpenAI:
+    """Return the process-wide Azure OpenAI client with a tuned HTTP pool."""
+
+    settings = get_settings()
+    return AsyncAzureOpenAI(
+        azure_endpoint=settings.azure_openai_endpoint,
+        api_key=settings.azure_openai_api_key,
+        api_version=settings.azure_openai_api_version,
+        http_client=DefaultAsyncHttpxClient(
+            limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT
+        ),
+    )
+
 
 class AzureOpenAIService:
     """Service for Azure OpenAI chat and embedding-related utilities."""
 
     def __init__(self) -> None:
-        # Instantiate the Azure OpenAI client once for reuse.
-        self._client = AsyncAzureOpenAI(
-            azure_endpoint=settings.azure_openai_endpoint,
-            api_key=settings.azure_openai_api_key,
-            api_version=settings.azure_openai_api_version,
-        )
-        self._encoding = tiktoken.get_encoding("cl100k_base")
+        # All instances share one client so connections and TLS sessions are reused.
+        self._client = _shared_client()
+        self._expected_dim = get_settings().embedding_dimensions
+        self._encoding = _cl100k()
+        self._encode = self._encoding.encode
+        # Cache per instance rather than on the method so self is not a cache key.
+        self._count_tokens_cached = lru_cache(maxsize=1024)(self._encode_length)
 
     @retry(
         retry=retry_if_exception_type((RateLimitError, APIError, APITimeoutError)),
@@ -46,7 +85,7 @@ class AzureOpenAIService:
 
         try:
             response = await self._client.embeddings.create(
-                model=settings.azure_openai_embedding_deployment_name,
+                model=get_settings().azure_openai_embedding_deployment_name,
                 input=text,
             )
             if not response.data:
@@ -72,7 +111,7 @@ class AzureOpenAIService:
 
         try:
             response = await self._client.embeddings.create(
-                model=settings.azure_openai_embedding_deployment_name,
+                model=get_settings().azure_openai_embedding_deployment_name,
                 input=texts,
             )
             vectors: List[Optional[List[float]]] = [None] * len(texts)
@@ -111,10 +150,8 @@ class AzureOpenAIService:
         messages = self._build_messages(
             query, conversation_history, context_documents, system_prompt
         )
-        prompt_tokens = self._count_tokens(messages)
-
         response = await self._client.chat.completions.create(
-            model=settings.azure_openai_deployment_name,
+            model=get_settings().azure_openai_deployment_name,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
@@ -124,10 +161,11 @@ class AzureOpenAIService:
         if response.choices:
             answer = response.choices[0].message.content or ""
 
-        usage_tokens = response.usage.total_tokens if response.usage else 0
-        if usage_tokens == 0:
-            completion_tokens = self._count_text_tokens(answer)
-            usage_tokens = prompt_tokens + completion_tokens
+        if response.usage and response.usage.total_tokens:
+            usage_tokens = response.usage.total_tokens
+        else:
+            # Only encode the prompt locally when Azure did not report usage.
+            usage_tokens = self._count_tokens(messages) + self._count_text_tokens(answer)
 
         return answer, usage_tokens
 
@@ -153,7 +191,7 @@ class AzureOpenAIService:
         )
 
         stream = await self._client.chat.completions.create(
-            model=settings.azure_openai_deployment_name,
+            model=get_settings().azure_openai_deployment_name,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
@@ -183,8 +221,12 @@ class AzureOpenAIService:
             context_text = self._format_context(context_documents)
             messages.append({"role": "system", "content": context_text})
 
-        for message in conversation_history or []:
-            messages.append({"role": message["role"], "content": message["content"]})
+        messages.extend(
+            [
+                {"role": message["role"], "content": message["content"]}
+                for message in conversation_history or []
+            ]
+        )
 
         if query:
             messages.append({"role": "user", "content": query})
@@ -193,19 +235,29 @@ class AzureOpenAIService:
     def _format_context(self, documents: List[Dict[str, Any]]) -> str:
         """Format context documents into a prompt segment."""
 
-        lines = ["Context:"]
-        for idx, doc in enumerate(documents, start=1):
-            title = doc.get("title") or doc.get("id") or f"Doc {idx}"
-            content = doc.get("content", "")
-            lines.append(f"[{idx}] {title}\n{content}")
-        return "\n\n".join(lines)
+        entries = (
+            f"[{idx}] {doc.get('title') or doc.get('id') or f'Doc {idx}'}\n{doc.get('content', '')}"
+            for idx, doc in enumerate(documents, start=1)
+        )
+        return "\n\n".join(chain(("Context:",), entries))
 
     def _count_tokens(self, messages: List[Dict[str, str]]) -> int:
         """Count tokens for a list of chat messages."""
 
         total = 0
+        long_texts: List[str] = []
         for message in messages:
-            total += self._count_text_tokens(message.get("content", ""))
+            text = message.get("content", "")
+            if len(text) > TOKEN_CACHE_MAX_TEXT_LENGTH:
+                long_texts.append(text)
+            elif text:
+                total += self._count_tokens_cached(text)
+
+        if len(long_texts) > 1:
+            # Only several uncached long texts are worth tiktoken's threaded batch call.
+            total += sum(map(len, self._encoding.encode_batch(long_texts, num_threads=4)))
+        elif long_texts:
+            total += self._encode_length(long_texts[0])
         return total
 
     def _count_text_tokens(self, text: str) -> int:
@@ -213,14 +265,28 @@ class AzureOpenAIService:
 
         if not text:
             return 0
-        return len(self._encoding.encode(text))
+        if len(text) > TOKEN_CACHE_MAX_TEXT_LENGTH:
+            return self._encode_length(text)
+        return self._count_tokens_cached(text)
+
+    def _encode_length(self, text: str) -> int:
+        """Encode text with tiktoken and return the number of tokens."""
+
+        return len(self._encode(text))
 
     def _warn_on_dimension_mismatch(self, vector: List[float]) -> None:
-        if not vector:
+        if not vector or len(vector) == self._expected_dim:
             return
-        if len(vector) != settings.embedding_dimensions:
+        if logger.isEnabledFor(logging.WARNING):
             logger.warning(
                 "Embedding dimension mismatch: expected %s, got %s",
-                settings.embedding_dimensions,
+                self._expected_dim,
                 len(vector),
             )
+
+
+@lru_cache(maxsize=1)
+def get_openai_service() -> AzureOpenAIService:
+    """Return the shared AzureOpenAIService used by the routes."""
+
+    return AzureOpenAIService()
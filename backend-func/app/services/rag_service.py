@@ -2,23 +2,112 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
+import heapq
 import re
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
-from app.config.config import settings
+import orjson
+from cachetools import LRUCache, TTLCache
+
+from app.config.config import get_settings
 from app.models.schemas import ChatRequest, ChatResponse, SourceDocument
 from app.services.openai_service import AzureOpenAIService
 from app.services.search_service import AzureSearchService
 from app.utils.logging import get_logger
-from app.utils.prompt_templates import STRICT_RAG_SYSTEM_PROMPT
+from app.utils.prompt_templates import render_strict_prompt
 
 logger = get_logger(__name__)
 
+# Repeated questions reuse their query embedding instead of calling Azure again.
+EMBEDDING_CACHE_SIZE = 1024
+# Normalized answers are reused when a question retrieves the same chunks again.
+RESPONSE_CACHE_SIZE = 2048
+RESPONSE_CACHE_TTL_SECONDS = 3600
+
+# Answer normalization runs on every chat response, so patterns are compiled once.
+_TRANSLATE_STRIP = str.maketrans({"\u200b": None, "\ufeff": None, "\r": "\n"})
+_TRANSLATE_COMPACT = str.maketrans({"\u200b": None, "\ufeff": None, "\u00a0": " "})
+_RE_TRAILING_WS_LINE = re.compile(r"[^\S\n]+$", re.MULTILINE)
+_RE_WS = re.compile(r"\s+")
+_RE_SOURCE_INLINE = re.compile(r"\[Source:.*?\]", re.IGNORECASE)
+_RE_SOURCES_FOOTER = re.compile(r"\n*\**\s*Sources\s*:.*$", re.IGNORECASE | re.DOTALL)
+_RE_HR_LINE = re.compile(r"^---\s*$", re.MULTILINE)
+_RE_ANSWER_PREFIX = re.compile(r"^(?:\*{0,2}\s*)?answer(?:\*{0,2})\s*[:\-]?\s*", re.IGNORECASE)
+_RE_ANSWER_CAMEL = re.compile(r"^(?:answer)(?=[A-Z])", re.IGNORECASE)
+_RE_HEADING_COLON = re.compile(r"(:)\s*(#{2,6}\s)")
+_RE_HEADING_NEWLINE = re.compile(r"(?<!\n)(#{2,6}\s)")
+_RE_DASH_AFTER_PUNCT = re.compile(r"([.!?])\s*-\s+")
+_RE_DASH_AFTER_HEADING = re.compile(r"(#{2,6}[^\n]*)\s*-\s+")
+_RE_TRAILING_WS = re.compile(r"[ \t]+\n")
+_RE_MULTIBLANK = re.compile(r"\n{3,}")
+# Phrases the strict prompt's model uses when the context lacks an answer.
+_RE_NO_INFO = re.compile(
+    r"i cannot find this information in the available documents"
+    r"|i don'?t have enough information in the knowledge base"
+    r"|not available in the provided context",
+    re.IGNORECASE,
+)
+_ANSWER_HEADER = "**Answer**\n\n"
+_UNCLEAN_CHARS = ("\r", "\u200b", "\ufeff", "\u00a0")
+_RE_PART = re.compile(r"(?i)\b(part\s+\d+[a-z]?\s*:\s*[A-Za-z][A-Za-z0-9 ,&()/\'\-]{3,90})")
+_RE_SECTION = re.compile(r"(?i)\b(section\s+\d+[a-z]?\s*:\s*[A-Za-z][A-Za-z0-9 ,&()/\'\-]{3,90})")
+_RE_NUMBERED = re.compile(
+    r"\b(\d+(?:\.\d+)*[\.)]?\s+[A-Z][A-Za-z0-9&()/\'\-]*(?:\s+[A-Za-z][A-Za-z0-9&()/\'\-]*){0,8})"
+)
+# (required lowercase keyword, pattern) in priority order; "" means always search.
+_SECTION_PATTERNS = (("part ", _RE_PART), ("section ", _RE_SECTION), ("", _RE_NUMBERED))
+# Section headings sit near the start of a chunk, so only scan this much text.
+_SECTION_SCAN_CHARS = 500
+
+
+@dataclass(slots=True)
+class _SourceGroup:
+    """Citation details collected for one source title in the footer."""
+
+    pages: List[int] = field(default_factory=list)
+    chunks: List[int] = field(default_factory=list)
+    sections: List[str] = field(default_factory=list)
+    plain: bool = False
+
+
+def _doc_score(doc: Dict[str, Any]) -> float:
+    """Return a search result's score, treating missing values as zero."""
+
+    return doc.get("score") or 0
+
+
+def _is_score_sorted(documents: List[Dict[str, Any]]) -> bool:
+    """Return True when documents are already in non-increasing score order."""
+
+    scores = [_doc_score(doc) for doc in documents]
+    return all(current >= following for current, following in zip(scores, scores[1:]))
+
+
+def _discard_task(task: asyncio.Future) -> None:
+    """Cancel a speculative task, or consume its outcome if it already finished."""
+
+    if not task.cancel() and not task.cancelled():
+        task.exception()
+
 
 class RAGService:
     """RAG pipeline that retrieves context and generates grounded answers."""
 
+    __slots__ = (
+        "_search_service",
+        "_openai_service",
+        "_relevance_threshold",
+        "_memory_limit",
+        "_embedding_hedge_seconds",
+        "_embedding_model",
+        "_embedding_cache",
+        "_chat_model",
+        "_response_cache",
+    )
+
     def __init__(
         self,
         search_service: Optional[AzureSearchService] = None,
@@ -26,6 +115,7 @@ class RAGService:
         relevance_threshold: Optional[float] = None,
         memory_limit: int = 5,
     ) -> None:
+        settings = get_settings()
         # Allow dependency injection for testing or customization.
         self._search_service = search_service or AzureSearchService()
         self._openai_service = openai_service or AzureOpenAIService()
@@ -35,6 +125,13 @@ class RAGService:
             else settings.minimum_relevance_score
         )
         self._memory_limit = memory_limit
+        self._embedding_hedge_seconds = settings.embedding_hedge_seconds
+        self._embedding_model = settings.azure_openai_embedding_deployment_name
+        self._embedding_cache: LRUCache = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
+        self._chat_model = settings.azure_openai_deployment_name
+        self._response_cache: TTLCache = TTLCache(
+            maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS
+        )
 
     async def process_query(
         self,
@@ -47,22 +144,8 @@ class RAGService:
     ) -> Dict[str, Any]:
         """Run the end-to-end RAG pipeline and return answer + sources."""
 
-        embedding = None
-        try:
-            embedding = await self._openai_service.generate_embedding(query)
-            if not embedding:
-                embedding = None
-        except Exception:  # pragma: no cover - defensive fallback
-            logger.exception("Embedding generation failed; falling back to text-only search.")
-
-        raw_results = await self._search_service.hybrid_search(
-            query_text=query,
-            query_embedding=embedding,
-            top_k=top_k,
-        )
-
-        filtered_results = self._filter_by_relevance(raw_results)
-        reranked_results = self.rerank_results(filtered_results)
+        raw_results = await self._retrieve(query, top_k)
+        reranked_results = self._filter_and_rerank(raw_results, top_k)
 
         if not reranked_results:
             return {
@@ -91,24 +174,37 @@ class RAGService:
                 "context_documents": reranked_results,
             }
 
-        context = self.format_context(reranked_results)
-        strict_prompt = STRICT_RAG_SYSTEM_PROMPT.format(context=context, question=query)
-
-        answer, tokens_used = await self._openai_service.chat_completion(
-            query="",
-            conversation_history=[],
-            context_documents=None,
-            system_prompt=strict_prompt,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
-
-        no_info_response = self._is_no_info_response(answer)
         sources = self.extract_sources(reranked_results)
-        answer = self._normalize_answer(
-            answer,
-            sources=[] if no_info_response else sources,
-        )
+        cache_key = self._response_cache_key(query, reranked_results, temperature, max_tokens)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            # Same question over the same chunks: reuse the answer and report its usage.
+            answer, no_info_response = cached["answer"], cached["no_info"]
+            tokens_used = cached["tokens_used"]
+        else:
+            context = self.format_context(reranked_results)
+            strict_prompt = render_strict_prompt(context, query)
+
+            answer, tokens_used = await self._openai_service.chat_completion(
+                query="",
+                conversation_history=[],
+                context_documents=None,
+                system_prompt=strict_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+
+            no_info_response = self._is_no_info_response(answer)
+            answer = self._normalize_answer(
+                answer,
+                sources=[] if no_info_response else sources,
+            )
+            self._response_cache[cache_key] = {
+                "answer": answer,
+                "no_info": no_info_response,
+                "tokens_used": tokens_used,
+                "doc_ids": self._cached_doc_ids(reranked_results),
+            }
 
         if no_info_response:
             return {
@@ -133,6 +229,101 @@ class RAGService:
             "context_documents": reranked_results,
         }
 
+    def invalidate_for_doc_id(self, doc_id: str) -> int:
+        """Drop cached answers built from a chunk or uploaded file; return the count."""
+
+        stale = [
+            key for key, entry in self._response_cache.items() if doc_id in entry["doc_ids"]
+        ]
+        for key in stale:
+            self._response_cache.pop(key, None)
+        return len(stale)
+
+    def _response_cache_key(
+        self,
+        query: str,
+        documents: List[Dict[str, Any]],
+        temperature: float,
+        max_tokens: int,
+    ) -> tuple:
+        """Key answers on the question, retrieved chunks, model and sampling settings."""
+
+        normalized_query = " ".join(query.split())
+        chunk_ids = tuple(sorted(str(doc.get("id") or "") for doc in documents))
+        return (normalized_query, chunk_ids, self._chat_model, float(temperature), max_tokens)
+
+    @staticmethod
+    def _cached_doc_ids(documents: List[Dict[str, Any]]) -> frozenset:
+        """Collect chunk and parent IDs so deletes can invalidate cached answers."""
+
+        ids = set()
+        for doc in documents:
+            if doc.get("id"):
+                ids.add(str(doc["id"]))
+            parent_id = (doc.get("metadata") or {}).get("parent_id")
+            if parent_id:
+                ids.add(str(parent_id))
+        return frozenset(ids)
+
+    async def _retrieve(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """Run hybrid search, hedging with text-only search if the embedding is slow."""
+
+        embedding_task = asyncio.ensure_future(self._embed_query(query))
+        text_task: Optional[asyncio.Future] = None
+        try:
+            done, _ = await asyncio.wait({embedding_task}, timeout=self._embedding_hedge_seconds)
+            if not done:
+                # The embedding is still retrying or slow; overlap a keyword search with it.
+                text_task = asyncio.ensure_future(
+                    self._search_service.hybrid_search(
+                        query_text=query, query_embedding=None, top_k=top_k
+                    )
+                )
+                done, _ = await asyncio.wait(
+                    {embedding_task, text_task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if embedding_task not in done:
+                    logger.info(
+                        "Embedding slower than %ss; using text-only results.",
+                        self._embedding_hedge_seconds,
+                    )
+                    _discard_task(embedding_task)
+                    return await text_task
+
+            embedding = embedding_task.result()
+            if text_task is not None and not embedding:
+                return await text_task
+        finally:
+            # Also runs when the caller is cancelled, e.g. on a client disconnect.
+            _discard_task(embedding_task)
+            if text_task is not None:
+                _discard_task(text_task)
+
+        return await self._search_service.hybrid_search(
+            query_text=query,
+            query_embedding=embedding,
+            top_k=top_k,
+        )
+
+    async def _embed_query(self, query: str) -> Optional[List[float]]:
+        """Embed the query, returning None so search can fall back to text-only."""
+
+        # Key on the deployment too so switching embedding models never reuses vectors.
+        digest = hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+        key = (self._embedding_model, digest)
+        cached = self._embedding_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            embedding = await self._openai_service.generate_embedding(query) or None
+        except Exception:  # pragma: no cover - defensive fallback
+            logger.exception("Embedding generation failed; falling back to text-only search.")
+            return None
+        if embedding:
+            self._embedding_cache[key] = embedding
+        return embedding
+
     async def answer_question(self, request: ChatRequest) -> ChatResponse:
         """Compatibility wrapper for the existing API routes."""
 
@@ -143,8 +334,9 @@ class RAGService:
             max_tokens=request.max_tokens or 512,
         )
 
+        # Sources are built by extract_sources from search results, so skip validation.
         sources = [
-            SourceDocument(
+            SourceDocument.model_construct(
                 id=item.get("id") or "",
                 title=item.get("title") or "",
                 relevance_score=float(item.get("relevance_score") or 0),
@@ -153,7 +345,7 @@ class RAGService:
             )
             for item in result["sources"]
         ]
-        return ChatResponse(
+        return ChatResponse.model_construct(
             answer=result["answer"],
             sources=sources,
             has_sufficient_context=result.get("has_sufficient_context", True),
@@ -167,59 +359,65 @@ class RAGService:
         if not documents:
             return ""
 
-        chunks: List[str] = []
+        parts: List[str] = []
+        extend = parts.extend
         for idx, doc in enumerate(documents, start=1):
             title = doc.get("title") or doc.get("id") or f"Source {idx}"
             doc_id = doc.get("id") or f"doc-{idx}"
             metadata = doc.get("metadata") or {}
-            metadata_text = json.dumps(metadata, ensure_ascii=False)
-            content = doc.get("content", "")
-            chunks.append(
-                f"[{idx}] Document ID: {doc_id}\nTitle: {title}\nMetadata: {metadata_text}\n{content}"
+            # Only embedded in the prompt, so orjson's compact form is fine here.
+            metadata_text = orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
+            extend(
+                (
+                    f"[{idx}] Document ID: ",
+                    str(doc_id),
+                    "\nTitle: ",
+                    str(title),
+                    "\nMetadata: ",
+                    metadata_text,
+                    "\n",
+                    str(doc.get("content", "")),
+                    "\n\n",
+                )
             )
-        return "\n\n".join(chunks)
+        # Drop the separator after the last document rather than rstrip its content.
+        parts.pop()
+        return "".join(parts)
 
     def extract_sources(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Extract source references for response citations."""
 
-        sources: List[Dict[str, Any]] = []
-        for doc in documents:
-            sources.append(
-                {
-                    "id": doc.get("id"),
-                    "title": doc.get("title") or doc.get("source"),
-                    "relevance_score": float(doc.get("score") or 0),
-                    "excerpt": self._build_excerpt(doc.get("content", "")),
-                    "metadata": doc.get("metadata") or {},
-                }
-            )
-        return sources
-
-    def rerank_results(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Optional reranking step based on relevance scores."""
-
-        return sorted(
-            documents,
-            key=lambda item: item.get("score", 0) or 0,
-            reverse=True,
-        )
+        build_excerpt = self._build_excerpt
+        return [
+            {
+                # Response structs are not validated, so never hand them a None string.
+                "id": str(doc.get("id") or ""),
+                "title": str(doc.get("title") or doc.get("source") or ""),
+                "relevance_score": float(doc.get("score") or 0),
+                "excerpt": build_excerpt(doc.get("content", "")),
+                "metadata": doc.get("metadata") or {},
+            }
+            for doc in documents
+        ]
 
-    def _filter_by_relevance(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Filter out documents below the relevance threshold."""
+    def _filter_and_rerank(
+        self, documents: List[Dict[str, Any]], top_k: int
+    ) -> List[Dict[str, Any]]:
+        """Drop low-relevance documents and keep the top_k by score in one pass."""
 
-        filtered = []
-        for doc in documents:
-            score = doc.get("score") or 0
-            if score >= self._relevance_threshold:
-                filtered.append(doc)
-        return filtered
+        threshold = self._relevance_threshold
+        relevant = [doc for doc in documents if _doc_score(doc) >= threshold]
+        if _is_score_sorted(relevant):
+            return relevant[: max(top_k, 0)]
+        # nlargest matches sorted(..., reverse=True)[:top_k], ties included.
+        return heapq.nlargest(top_k, relevant, key=_doc_score)
 
     def _build_excerpt(self, content: str) -> str:
         """Return a short excerpt for source attribution."""
 
         if not content:
             return ""
-        return content[:300]
+        return content if len(content) <= 300 else content[:300]
 
     def _normalize_answer(
         self,
@@ -231,25 +429,10 @@ class RAGService:
         if not answer:
             return answer
 
-        cleaned = answer.replace("\r\n", "\n").replace("\r", "\n")
-        cleaned = cleaned.replace("\u200b", "").replace("\ufeff", "")
-        cleaned = re.sub(r"\[Source:.*?\]", "", cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(
-            r"\n*\**\s*Sources\s*:.*$",
-            "",
-            cleaned,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-        cleaned = re.sub(r"^---\s*$", "", cleaned, flags=re.MULTILINE)
-        cleaned = self._repair_malformed_prefix(cleaned)
-        cleaned = self._normalize_markdown_structure(cleaned)
-        cleaned = self._format_bullets_if_needed(cleaned)
-        cleaned = self._compact_blank_lines(cleaned)
-
-        if not cleaned.startswith("**Answer**"):
-            cleaned = f"**Answer**\n\n{cleaned}".strip()
-
-        cleaned = self._compact_blank_lines(cleaned)
+        if self._is_clean_answer(answer):
+            cleaned = answer
+        else:
+            cleaned = self._clean_answer(answer)
 
         if not sources:
             return cleaned
@@ -259,6 +442,58 @@ class RAGService:
             cleaned = f"{cleaned}\n\n{footer}"
         return cleaned
 
+    def _clean_answer(self, answer: str) -> str:
+        """Run the full citation-stripping and markdown normalization pipeline."""
+
+        # Replace \r\n first so the translate table's \r -> \n does not double breaks.
+        cleaned = answer.replace("\r\n", "\n").translate(_TRANSLATE_STRIP)
+        # Each pattern needs these characters, so skip the regex scan when absent.
+        if "[" in cleaned:
+            cleaned = _RE_SOURCE_INLINE.sub("", cleaned)
+        if ":" in cleaned:
+            cleaned = _RE_SOURCES_FOOTER.sub("", cleaned)
+        if "---" in cleaned:
+            cleaned = _RE_HR_LINE.sub("", cleaned)
+        cleaned = self._repair_malformed_prefix(cleaned)
+        cleaned = self._normalize_markdown_structure(cleaned)
+        cleaned = self._format_bullets_if_needed(cleaned)
+        cleaned = self._compact_blank_lines(cleaned)
+
+        if not cleaned.startswith("**Answer**"):
+            # cleaned is already compact, so adding the header cannot un-compact it.
+            cleaned = f"**Answer**\n\n{cleaned}".strip()
+        return cleaned
+
+    @staticmethod
+    def _is_clean_answer(answer: str) -> bool:
+        """Return True when _clean_answer would leave the answer unchanged."""
+
+        if not answer.startswith(_ANSWER_HEADER) or any(c in answer for c in _UNCLEAN_CHARS):
+            return False
+
+        # The prefix repair strips the header and the pipeline adds it back, so
+        # the body must not start with anything that repair would also consume.
+        body = answer[len(_ANSWER_HEADER) :]
+        if not body or body[0].isspace() or body[0] in ":-" or body[-1].isspace():
+            return False
+        if body[:6].lower() == "answer" or body.startswith("**Answer**"):
+            return False
+        if "\n" not in body and " - " in body:
+            return False
+
+        checks = (
+            ("[" in answer, _RE_SOURCE_INLINE, answer),
+            (":" in answer, _RE_SOURCES_FOOTER, answer),
+            ("---" in answer, _RE_HR_LINE, answer),
+            ("#" in body, _RE_HEADING_COLON, body),
+            ("#" in body, _RE_HEADING_NEWLINE, body),
+            ("-" in body, _RE_DASH_AFTER_PUNCT, body),
+            ("-" in body, _RE_DASH_AFTER_HEADING, body),
+            (True, _RE_TRAILING_WS_LINE, body),
+            (True, _RE_MULTIBLANK, body),
+        )
+        return not any(needed and pattern.search(text) for needed, pattern, text in checks)
+
     def _format_bullets_if_needed(self, text: str) -> str:
         """Convert inline dash lists into proper bullet lists."""
 
@@ -277,25 +512,25 @@ class RAGService:
         """Fix malformed answer prefixes like '|AnswerText' from model output."""
 
         cleaned = text.lstrip("|` \n")
-        cleaned = re.sub(
-            r"^(?:\*{0,2}\s*)?answer(?:\*{0,2})\s*[:\-]?\s*",
-            "",
-            cleaned,
-            flags=re.IGNORECASE,
-        )
-        cleaned = re.sub(r"^(?:answer)(?=[A-Z])", "", cleaned, flags=re.IGNORECASE)
+        cleaned = _RE_ANSWER_PREFIX.sub("", cleaned)
+        cleaned = _RE_ANSWER_CAMEL.sub("", cleaned)
         return cleaned.strip()
 
     @staticmethod
     def _normalize_markdown_structure(text: str) -> str:
         """Improve markdown readability by fixing missing line breaks."""
 
-        normalized = re.sub(r"(:)\s*(#{2,6}\s)", r"\1\n\n\2", text)
-        normalized = re.sub(r"(?<!\n)(#{2,6}\s)", r"\n\n\1", normalized)
-        normalized = re.sub(r"([.!?])\s*-\s+", r"\1\n- ", normalized)
-        normalized = re.sub(r"(#{2,6}[^\n]*)\s*-\s+", r"\1\n- ", normalized)
-        normalized = re.sub(r"[ \t]+\n", "\n", normalized)
-        normalized = re.sub(r"\n{3,}", "\n\n", normalized)
+        normalized = text
+        has_heading = "#" in normalized
+        if has_heading:
+            normalized = _RE_HEADING_COLON.sub(r"\1\n\n\2", normalized)
+            normalized = _RE_HEADING_NEWLINE.sub(r"\n\n\1", normalized)
+        if "-" in normalized:
+            normalized = _RE_DASH_AFTER_PUNCT.sub(r"\1\n- ", normalized)
+            if has_heading:
+                normalized = _RE_DASH_AFTER_HEADING.sub(r"\1\n- ", normalized)
+        # Trailing spaces and blank runs are left to _compact_blank_lines, which
+        # _clean_answer runs next and which removes a superset of them.
         return normalized.strip()
 
     @staticmethod
@@ -305,26 +540,14 @@ class RAGService:
         if not text:
             return text
 
-        text = text.replace("\u200b", "").replace("\ufeff", "")
-        compacted: List[str] = []
-        blank_count = 0
-        for raw_line in text.split("\n"):
-            line = (
-                raw_line.replace("\u200b", "")
-                .replace("\ufeff", "")
-                .replace("\u00a0", " ")
-                .rstrip()
-            )
-            if not line.strip():
-                blank_count += 1
-                if blank_count <= max_blank_lines:
-                    compacted.append("")
-                continue
-
-            blank_count = 0
-            compacted.append(line)
-
-        return "\n".join(compacted).strip()
+        text = _RE_TRAILING_WS_LINE.sub("", text.translate(_TRANSLATE_COMPACT))
+        if max_blank_lines == 1:
+            blank_run, replacement = _RE_MULTIBLANK, "\n\n"
+        else:
+            allowed = max(max_blank_lines, 0)
+            blank_run = re.compile("\n{%d,}" % (allowed + 2))
+            replacement = "\n" * (allowed + 1)
+        return blank_run.sub(replacement, text).strip()
 
     @staticmethod
     def _is_no_info_response(answer: str) -> bool:
@@ -333,13 +556,7 @@ class RAGService:
         if not answer:
             return True
 
-        text = answer.lower()
-        markers = [
-            "i cannot find this information in the available documents",
-            "i don't have enough information in the knowledge base",
-            "not available in the provided context",
-        ]
-        return any(marker in text for marker in markers)
+        return _RE_NO_INFO.search(answer) is not None
 
     def _build_sources_footer(self, sources: List[Dict[str, Any]]) -> str:
         """Build a single sources footer from the source list."""
@@ -347,7 +564,7 @@ class RAGService:
         if not sources:
             return ""
 
-        grouped: Dict[str, Dict[str, Any]] = {}
+        grouped: Dict[str, _SourceGroup] = {}
         for source in sources:
             title = str(source.get("title") or source.get("id") or "Document")
             metadata = source.get("metadata") or {}
@@ -358,30 +575,27 @@ class RAGService:
                 str(source.get("excerpt") or ""),
             )
 
-            if title not in grouped:
-                grouped[title] = {
-                    "pages": set(),
-                    "chunks": set(),
-                    "sections": set(),
-                    "plain": False,
-                }
+            group = grouped.get(title)
+            if group is None:
+                group = grouped[title] = _SourceGroup()
 
             if page_number is not None:
-                grouped[title]["pages"].add(page_number)
+                group.pages.append(page_number)
             elif chunk_index is not None:
-                grouped[title]["chunks"].add(chunk_index + 1)
+                group.chunks.append(chunk_index + 1)
             else:
-                grouped[title]["plain"] = True
+                group.plain = True
 
             if section_label:
-                grouped[title]["sections"].add(section_label)
+                group.sections.append(section_label)
 
         entries = []
-        for title in sorted(grouped, key=lambda item: item.lower()):
+        for title in sorted(grouped, key=str.lower):
             source_group = grouped[title]
-            pages = sorted(source_group["pages"])
-            chunks = sorted(source_group["chunks"])
-            sections = sorted(source_group["sections"], key=lambda item: item.lower())
+            # Deduplicate only here; most titles contribute a single entry.
+            pages = sorted(set(source_group.pages))
+            chunks = sorted(set(source_group.chunks))
+            sections = sorted(dict.fromkeys(source_group.sections), key=str.lower)
 
             label_parts: List[str] = []
             if sections:
@@ -395,14 +609,14 @@ class RAGService:
                 page_text = (
                     f"Page {pages[0]}"
                     if len(pages) == 1
-                    else "Pages " + ", ".join(str(page) for page in pages)
+                    else "Pages " + ", ".join(map(str, pages))
                 )
                 label_parts.append(page_text)
             elif chunks and not sections:
                 chunk_text = (
                     f"Chunk {chunks[0]}"
                     if len(chunks) == 1
-                    else "Chunks " + ", ".join(str(chunk) for chunk in chunks)
+                    else "Chunks " + ", ".join(map(str, chunks))
                 )
                 label_parts.append(chunk_text)
 
@@ -454,23 +668,19 @@ class RAGService:
         if not text:
             return None
 
-        normalized = " ".join(
-            text.replace("\u200b", "")
-            .replace("\ufeff", "")
-            .replace("\u00a0", " ")
-            .split()
-        ).strip()
+        # Regex \s matches exactly the characters str.split() breaks on.
+        normalized = _RE_WS.sub(" ", text.translate(_TRANSLATE_COMPACT)).strip()
         if not normalized:
             return None
 
-        patterns = [
-            r"(?i)\b(part\s+\d+[a-z]?\s*:\s*[A-Za-z][A-Za-z0-9 ,&()/\'\-]{3,90})",
-            r"(?i)\b(section\s+\d+[a-z]?\s*:\s*[A-Za-z][A-Za-z0-9 ,&()/\'\-]{3,90})",
-            r"\b(\d+(?:\.\d+)*[\.)]?\s+[A-Z][A-Za-z0-9&()/\'\-]*(?:\s+[A-Za-z][A-Za-z0-9&()/\'\-]*){0,8})",
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, normalized)
+        normalized = normalized[:_SECTION_SCAN_CHARS]
+        # re's IGNORECASE also folds a few non-ASCII letters onto ASCII ones, so the
+        # keyword shortcut is only safe for ASCII text.
+        lowered = normalized.lower() if normalized.isascii() else None
+        for keyword, pattern in _SECTION_PATTERNS:
+            if keyword and lowered is not None and keyword not in lowered:
+                continue
+            match = pattern.search(normalized)
             if not match:
                 continue
             label = match.group(1).strip().rstrip(".,;:-")
@@ -3,15 +3,22 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
+import time
+from array import array
 from typing import Any, Dict, List, Optional
 
 from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import HttpResponseError, ServiceRequestError
+from azure.core.pipeline.transport import AioHttpTransport
 from azure.search.documents.aio import SearchClient
 from azure.search.documents.indexes.aio import SearchIndexClient
 from azure.search.documents.indexes.models import (
     HnswAlgorithmConfiguration,
+    HnswParameters,
+    RescoringOptions,
+    ScalarQuantizationCompression,
     SearchField,
     SearchFieldDataType,
     SearchIndex,
@@ -22,15 +29,41 @@ from azure.search.documents.indexes.models import (
     SemanticSearch,
     SimpleField,
     VectorSearch,
+    VectorSearchAlgorithmMetric,
     VectorSearchProfile,
 )
 from azure.search.documents.models import VectorizedQuery
+from cachetools import TTLCache
+import numpy as np
+import orjson
 
-from app.config.config import settings
+from app.config.config import get_settings
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Repeated vector queries reuse their normalized results instead of another ANN
+# search. Writes through this service clear the cache; the TTL bounds staleness
+# from writes made by other instances.
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL_SECONDS = 300
+# Paraphrased questions whose embeddings are closer than the configured cosine
+# threshold reuse the results of an earlier query with the same options.
+SEMANTIC_CACHE_SIZE = 128
+# Pages of list_all_documents requested at once, to stay clear of throttling.
+LIST_PAGE_CONCURRENCY = 8
+# Azure Search accepts up to 1000 documents and 16 MB per indexing request;
+# the byte bound leaves headroom for the SDK's own request envelope.
+UPLOAD_BATCH_SIZE = 1000
+UPLOAD_BATCH_BYTES = 14 * 1024 * 1024
+UPLOAD_CONCURRENCY = 4
+# Result fields mapped onto the normalized document; the rest become metadata.
+_RESERVED_RESULT_KEYS = frozenset(
+    {"content", "chunk", "text", "title", "source", "@search.score", "id", "metadata"}
+)
+# Top-level chunk fields that indexes provisioned elsewhere may not define.
+_PARENT_FIELDS = frozenset({"parent_id", "chunk_index"})
+
 
 class IndexConfigurationError(RuntimeError):
     """Raised when the index schema cannot be updated due to incompatible changes."""
@@ -40,43 +73,134 @@ class SearchServiceUnavailableError(RuntimeError):
     """Raised when Azure Search cannot be reached due to connectivity issues."""
 
 
+class _SemanticCache:
+    """Recent query embeddings and their results, matched by cosine similarity."""
+
+    def __init__(self, dimensions: int, threshold: float) -> None:
+        self._threshold = threshold
+        # Rows are L2-normalized, so one matrix-vector product gives every cosine.
+        self._vectors = np.zeros((SEMANTIC_CACHE_SIZE, dimensions), dtype=np.float32)
+        self._results: List[List[Dict[str, Any]]] = []
+        self._stored_at = np.zeros(SEMANTIC_CACHE_SIZE)
+        self._last_used = np.zeros(SEMANTIC_CACHE_SIZE)
+
+    def lookup(self, vector: np.ndarray) -> Optional[List[Dict[str, Any]]]:
+        """Return results of the closest cached query if it is similar and fresh."""
+
+        filled = len(self._results)
+        if not filled:
+            return None
+        similarities = self._vectors[:filled] @ vector
+        best = int(similarities.argmax())
+        now = time.monotonic()
+        if (
+            similarities[best] < self._threshold
+            or now - self._stored_at[best] > SEARCH_CACHE_TTL_SECONDS
+        ):
+            return None
+        self._last_used[best] = now
+        return self._results[best]
+
+    def store(self, vector: np.ndarray, results: List[Dict[str, Any]]) -> None:
+        """Remember results, replacing the least recently used row when full."""
+
+        now = time.monotonic()
+        if len(self._results) < SEMANTIC_CACHE_SIZE:
+            row = len(self._results)
+            self._results.append(results)
+        else:
+            row = int(self._last_used.argmin())
+            self._results[row] = results
+        self._vectors[row] = vector
+        self._stored_at[row] = now
+        self._last_used[row] = now
+
+
 class AzureSearchService:
     """Service for managing and querying Azure AI Search indexes."""
 
+    __slots__ = (
+        "_index_name",
+        "_transport",
+        "_search_client",
+        "_index_client",
+        "_use_semantic",
+        "_auto_create_index",
+        "_embedding_dimensions",
+        "_hnsw_parameters",
+        "_index_ready",
+        "_index_lock",
+        "_has_parent_fields",
+        "_search_cache",
+        "_semantic_cache_threshold",
+        "_semantic_caches",
+    )
+
     def __init__(self) -> None:
+        settings = get_settings()
         # Initialize clients for index management and document search.
         credential = AzureKeyCredential(settings.azure_search_admin_key)
         self._index_name = settings.azure_search_index_name
+        # Both clients send through one aiohttp session and its connection pool.
+        self._transport = AioHttpTransport()
         self._search_client = SearchClient(
             endpoint=settings.azure_search_service_endpoint,
             index_name=self._index_name,
             credential=credential,
+            transport=self._transport,
         )
         self._index_client = SearchIndexClient(
             endpoint=settings.azure_search_service_endpoint,
             credential=credential,
+            transport=self._transport,
         )
         self._use_semantic = settings.azure_search_use_semantic
         self._auto_create_index = settings.azure_search_auto_create_index
         self._embedding_dimensions = settings.embedding_dimensions
-        self._index_ready = False
+        self._hnsw_parameters = HnswParameters(
+            m=settings.hnsw_m,
+            ef_construction=settings.hnsw_ef_construction,
+            ef_search=settings.hnsw_ef_search,
+            metric=VectorSearchAlgorithmMetric.COSINE,
+        )
+        self._index_ready: bool = False
         self._index_lock = asyncio.Lock()
+        # Set by _ensure_index; without these fields lookups read the metadata JSON.
+        self._has_parent_fields: bool = False
+        self._search_cache: TTLCache = TTLCache(
+            maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL_SECONDS
+        )
+        # A threshold above 1 disables the semantic cache.
+        self._semantic_cache_threshold = settings.semantic_cache_threshold
+        self._semantic_caches: Dict[tuple, _SemanticCache] = {}
         logger.info("AzureSearchService initialized for index '%s'", self._index_name)
 
     async def create_or_update_index(self) -> None:
         """Create or update the search index with vector and semantic settings."""
 
         try:
-            index = self._build_index_schema()
-            await self._index_client.create_or_update_index(index)
+            try:
+                await self._index_client.create_or_update_index(self._build_index_schema())
+            except HttpResponseError as exc:
+                if not self._is_field_change_conflict(exc):
+                    raise
+                # Indexes created before vector compression keep a stored,
+                # uncompressed embedding field that cannot be altered in place.
+                logger.warning(
+                    "Index '%s' predates compressed vector storage; keeping its existing "
+                    "embedding field. Recreate the index to enable compression.",
+                    self._index_name,
+                )
+                await self._index_client.create_or_update_index(
+                    self._build_index_schema(compact_vectors=False)
+                )
             logger.info("Index '%s' created or updated", self._index_name)
         except ServiceRequestError as exc:
             raise SearchServiceUnavailableError(
                 "Cannot reach Azure Search. Verify endpoint, firewall/network rules, and service availability."
             ) from exc
         except HttpResponseError as exc:
-            message = str(exc)
-            if "CannotChangeExistingField" in message or "cannot be changed" in message:
+            if self._is_field_change_conflict(exc):
                 raise IndexConfigurationError(
                     "Embedding dimensions changed. Set a new AZURE_SEARCH_INDEX_NAME or delete/recreate the existing index."
                 ) from exc
@@ -95,13 +219,26 @@ class AzureSearchService:
 
         await self._ensure_index()
 
-        normalized = [self._normalize_document(doc) for doc in documents]
+        normalized = [
+            self._normalize_document(doc, self._has_parent_fields) for doc in documents
+        ]
+
+        semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+        async def upload(batch: List[Dict[str, Any]]) -> List[Any]:
+            async with semaphore:
+                return await self._search_client.upload_documents(documents=batch)
 
         try:
-            results = await self._search_client.upload_documents(documents=normalized)
-            failed = [result for result in results if not result.succeeded]
+            batch_results = await asyncio.gather(
+                *(upload(batch) for batch in self._upload_batches(normalized))
+            )
+            failed = [
+                result for results in batch_results for result in results if not result.succeeded
+            ]
             if failed:
                 raise RuntimeError(f"Failed to upload {len(failed)} documents")
+            self.cache_clear()
             logger.info("Uploaded %s documents", len(normalized))
         except ServiceRequestError as exc:
             raise SearchServiceUnavailableError(
@@ -116,22 +253,22 @@ class AzureSearchService:
     ) -> List[Dict[str, Any]]:
         """Perform vector similarity search using the query embedding."""
 
+        cache_key = self._search_cache_key("vector", query_embedding, top_k, "*")
+        cached = self._cached_results(cache_key, query_embedding)
+        if cached is not None:
+            return cached
+
         await self._ensure_index()
 
         try:
-            vector_query = VectorizedQuery(
-                vector=query_embedding,
-                k_nearest_neighbors=top_k,
-                fields="embedding",
-            )
             results = await self._search_client.search(
                 search_text="*",
-                vector_queries=[vector_query],
+                vector_queries=[self._vector_query(query_embedding, top_k)],
                 top=top_k,
             )
             normalized = await self._collect_results(results)
             logger.info("Vector search returned %s results", len(normalized))
-            return normalized
+            return self._remember(cache_key, query_embedding, normalized)
         except ServiceRequestError as exc:
             raise SearchServiceUnavailableError(
                 "Cannot reach Azure Search. Verify endpoint, firewall/network rules, and service availability."
@@ -148,20 +285,23 @@ class AzureSearchService:
     ) -> List[Dict[str, Any]]:
         """Combine keyword and vector search with semantic fallback."""
 
+        # Only vector queries are cached: they carry the ANN cost, and text-only
+        # calls such as the health probe must keep reaching the service.
+        search_text = query_text or "*"
+        cache_key = None
+        if query_embedding:
+            cache_key = self._search_cache_key("hybrid", query_embedding, top_k, search_text)
+            cached = self._cached_results(cache_key, query_embedding)
+            if cached is not None:
+                return cached
+
         await self._ensure_index()
 
         vector_queries = None
         if query_embedding:
-            vector_queries = [
-                VectorizedQuery(
-                    vector=query_embedding,
-                    k_nearest_neighbors=top_k,
-                    fields="embedding",
-                )
-            ]
+            vector_queries = [self._vector_query(query_embedding, top_k)]
 
         try:
-            search_text = query_text or "*"
             if self._use_semantic:
                 results = await self._search_client.search(
                     search_text=search_text,
@@ -178,7 +318,7 @@ class AzureSearchService:
                 )
             normalized = await self._collect_results(results)
             logger.info("Hybrid search returned %s results", len(normalized))
-            return normalized
+            return self._remember(cache_key, query_embedding, normalized)
         except ServiceRequestError as exc:
             raise SearchServiceUnavailableError(
                 "Cannot reach Azure Search. Verify endpoint, firewall/network rules, and service availability."
@@ -193,7 +333,7 @@ class AzureSearchService:
                 )
                 normalized = await self._collect_results(results)
                 logger.info("Keyword fallback returned %s results", len(normalized))
-                return normalized
+                return self._remember(cache_key, query_embedding, normalized)
             except ServiceRequestError as exc:
                 raise SearchServiceUnavailableError(
                     "Cannot reach Azure Search. Verify endpoint, firewall/network rules, and service availability."
@@ -217,6 +357,7 @@ class AzureSearchService:
             failed = [result for result in results if not result.succeeded]
             if failed:
                 raise RuntimeError(f"Failed to delete {len(failed)} documents")
+            self.cache_clear()
             logger.info("Deleted %s documents", len(document_ids))
         except ServiceRequestError as exc:
             raise SearchServiceUnavailableError(
@@ -226,29 +367,67 @@ class AzureSearchService:
             logger.exception("Document deletion failed")
             raise
 
+    async def find_ids_by_parent(self, parent_id: str, batch_size: int = 1000) -> List[str]:
+        """Return chunk IDs for an uploaded file using a server-side parent filter."""
+
+        await self._ensure_index()
+
+        try:
+            chunk_ids: List[str] = []
+            if self._has_parent_fields:
+                chunk_ids = await self._find_ids_by_parent_field(parent_id, batch_size)
+            if not chunk_ids:
+                # Chunks indexed before the parent_id field existed, or into an index
+                # without it, only carry it inside the metadata JSON.
+                chunk_ids = await self._find_legacy_ids_by_parent(parent_id)
+
+            logger.info("Parent filter matched %s chunks", len(chunk_ids))
+            return chunk_ids
+        except ServiceRequestError as exc:
+            raise SearchServiceUnavailableError(
+                "Cannot reach Azure Search. Verify endpoint, firewall/network rules, and service availability."
+            ) from exc
+        except Exception:
+            logger.exception("Parent filter search failed")
+            raise
+
     async def list_all_documents(self, batch_size: int = 1000) -> List[Dict[str, Any]]:
         """List all indexed documents in pages (avoids the default top=50 cap)."""
 
         await self._ensure_index()
 
-        collected: List[Dict[str, Any]] = []
-        skip = 0
         page_size = max(1, min(batch_size, 1000))
 
         try:
-            while True:
-                results = await self._search_client.search(
-                    search_text="*",
-                    top=page_size,
-                    skip=skip,
-                )
-                page = await self._collect_results(results)
-                if not page:
-                    break
-                collected.extend(page)
-                if len(page) < page_size:
-                    break
-                skip += len(page)
+            # The first page also reports the total, so the other pages can be
+            # requested together instead of one round trip at a time.
+            first_page = await self._search_client.search(
+                search_text="*",
+                top=page_size,
+                skip=0,
+                include_total_count=True,
+            )
+            collected = await self._collect_results(first_page)
+            last_page = collected
+            if len(collected) == page_size:
+                total_count = await first_page.get_count() or 0
+                semaphore = asyncio.Semaphore(LIST_PAGE_CONCURRENCY)
+
+                async def fetch(skip: int) -> List[Dict[str, Any]]:
+                    async with semaphore:
+                        return await self._fetch_page(skip, page_size)
+
+                skips = range(page_size, total_count, page_size)
+                for page in await asyncio.gather(*(fetch(skip) for skip in skips)):
+                    collected.extend(page)
+                    last_page = page
+
+                # Documents indexed after the count was taken spill past the last page.
+                skip = page_size * (len(skips) + 1)
+                while len(last_page) == page_size:
+                    last_page = await self._fetch_page(skip, page_size)
+                    collected.extend(last_page)
+                    skip += page_size
 
             logger.info("List-all search returned %s results", len(collected))
             return collected
@@ -260,6 +439,45 @@ class AzureSearchService:
             logger.exception("List-all search failed")
             raise
 
+    async def parent_facets(self, max_parents: int = 10000) -> Optional[Dict[str, Any]]:
+        """Count chunks per uploaded file with a parent_id facet instead of a full scan.
+
+        Returns None when the index has no parent_id field to facet on.
+        """
+
+        await self._ensure_index()
+        if not self._has_parent_fields:
+            return None
+
+        try:
+            results = await self._search_client.search(
+                search_text="*",
+                facets=[f"parent_id,count:{max_parents}"],
+                top=0,
+                include_total_count=True,
+            )
+            facets = await results.get_facets() or {}
+            total_count = await results.get_count() or 0
+            counts = {
+                str(item["value"]): int(item.get("count") or 0)
+                for item in facets.get("parent_id", [])
+                if item.get("value")
+            }
+            titles = await self._first_chunk_titles() if counts else {}
+            parents = [
+                {"id": parent_id, "title": titles.get(parent_id), "chunk_count": count}
+                for parent_id, count in counts.items()
+            ]
+            logger.info("Parent facet query returned %s files", len(parents))
+            return {"total_count": int(total_count), "parents": parents}
+        except ServiceRequestError as exc:
+            raise SearchServiceUnavailableError(
+                "Cannot reach Azure Search. Verify endpoint, firewall/network rules, and service availability."
+            ) from exc
+        except Exception:
+            logger.exception("Parent facet query failed")
+            raise
+
     async def get_index_stats(self) -> Dict[str, Any]:
         """Fetch index statistics such as document count."""
 
@@ -279,47 +497,277 @@ class AzureSearchService:
             logger.exception("Failed to fetch index statistics")
             return {}
 
+    def cache_clear(self) -> None:
+        """Drop cached search results, e.g. after the index contents change."""
+
+        self._search_cache.clear()
+        self._semantic_caches.clear()
+
     async def close(self) -> None:
         """Close underlying Azure Search clients."""
 
         await self._search_client.close()
         await self._index_client.close()
+        await self._transport.close()
 
     async def _ensure_index(self) -> None:
-        """Create the index on first use when auto-provisioning is enabled."""
+        """Create the index on first use when enabled and detect its parent fields."""
 
-        if not self._auto_create_index or self._index_ready:
+        # Hot path for every call once the index exists: plain attribute reads, no lock.
+        # Loops and batch helpers should still call this once up front, not per item.
+        if self._index_ready:
             return
 
         async with self._index_lock:
             if self._index_ready:
                 return
-            await self.create_or_update_index()
+            if self._auto_create_index:
+                await self.create_or_update_index()
+                # The schema pushed above always defines the parent fields.
+                self._has_parent_fields = True
+            else:
+                self._has_parent_fields = await self._index_has_parent_fields()
             self._index_ready = True
 
-    def _build_index_schema(self) -> SearchIndex:
-        """Build the index schema with vector and semantic configuration."""
+    async def _index_has_parent_fields(self) -> bool:
+        """Check whether a pre-provisioned index can filter and facet on parent fields."""
+
+        try:
+            index = await self._index_client.get_index(self._index_name)
+        except ServiceRequestError as exc:
+            raise SearchServiceUnavailableError(
+                "Cannot reach Azure Search. Verify endpoint, firewall/network rules, and service availability."
+            ) from exc
+        except HttpResponseError:
+            logger.warning(
+                "Cannot read schema of index '%s'; using metadata lookups", self._index_name
+            )
+            return False
+
+        fields = {field.name: field for field in index.fields or []}
+        parent_field = fields.get("parent_id")
+        chunk_field = fields.get("chunk_index")
+        supported = bool(
+            parent_field is not None
+            and parent_field.filterable
+            and parent_field.facetable
+            and chunk_field is not None
+            and chunk_field.filterable
+        )
+        if not supported:
+            logger.warning(
+                "Index '%s' has no filterable parent_id/chunk_index fields; "
+                "using metadata lookups",
+                self._index_name,
+            )
+        return supported
+
+    async def _find_ids_by_parent_field(self, parent_id: str, batch_size: int) -> List[str]:
+        """Page through chunk IDs matching the top-level parent_id field."""
+
+        escaped = parent_id.replace("'", "''")
+        page_size = max(1, min(batch_size, 1000))
+        chunk_ids: List[str] = []
+        skip = 0
+        while True:
+            results = await self._search_client.search(
+                search_text="*",
+                filter=f"parent_id eq '{escaped}'",
+                select=["id"],
+                top=page_size,
+                skip=skip,
+            )
+            page = [result["id"] async for result in results if result.get("id")]
+            chunk_ids.extend(page)
+            if len(page) < page_size:
+                return chunk_ids
+            skip += len(page)
+
+    async def _find_legacy_ids_by_parent(self, parent_id: str) -> List[str]:
+        """Match a parent ID inside the metadata JSON of older chunks."""
+
+        results = await self._search_client.search(
+            search_text=f'"{parent_id}"',
+            search_fields=["metadata"],
+            select=["id", "metadata"],
+            top=1000,
+        )
+        page = await self._collect_results(results)
+        return [
+            doc["id"]
+            for doc in page
+            if doc.get("id") and (doc.get("metadata") or {}).get("parent_id") == parent_id
+        ]
+
+    async def _fetch_page(self, skip: int, page_size: int) -> List[Dict[str, Any]]:
+        """Fetch one page of the match-all query used by list_all_documents."""
+
+        results = await self._search_client.search(
+            search_text="*",
+            top=page_size,
+            skip=skip,
+        )
+        return await self._collect_results(results)
+
+    async def _first_chunk_titles(self, batch_size: int = 1000) -> Dict[str, str]:
+        """Map parent IDs to file titles using only the first chunk of each file."""
+
+        titles: Dict[str, str] = {}
+        skip = 0
+        while True:
+            results = await self._search_client.search(
+                search_text="*",
+                filter="chunk_index eq 0",
+                select=["parent_id", "title"],
+                top=batch_size,
+                skip=skip,
+            )
+            page = [result async for result in results]
+            for result in page:
+                if result.get("parent_id"):
+                    titles[result["parent_id"]] = result.get("title") or ""
+            if len(page) < batch_size:
+                return titles
+            skip += len(page)
+
+    @staticmethod
+    def _vector_query(query_embedding: List[float], top_k: int) -> VectorizedQuery:
+        """Build the k-NN query against the embedding field."""
+
+        # The SDK JSON-encodes the vector, so a list of Python floats is passed as
+        # is; float32 values would print with more digits, not fewer.
+        return VectorizedQuery(
+            vector=query_embedding,
+            k_nearest_neighbors=top_k,
+            fields="embedding",
+        )
+
+    @staticmethod
+    def _search_cache_key(
+        kind: str, query_embedding: List[float], top_k: int, search_text: str
+    ) -> tuple:
+        """Key a vector query by a digest of its embedding and the search options."""
+
+        digest = hashlib.blake2b(array("d", query_embedding).tobytes(), digest_size=16).digest()
+        return (kind, digest, top_k, search_text)
+
+    def _cached_results(
+        self, cache_key: tuple, query_embedding: List[float]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of cached results for this exact or a near-identical query."""
+
+        cached = self._search_cache.get(cache_key)
+        if cached is None:
+            vector = self._unit_vector(query_embedding)
+            if vector is not None:
+                semantic_cache = self._semantic_caches.get(self._semantic_scope(cache_key, vector))
+                if semantic_cache is not None:
+                    cached = semantic_cache.lookup(vector)
+                    if cached is not None:
+                        logger.info("Semantic cache hit for a similar query")
+        return None if cached is None else list(cached)
+
+    def _remember(
+        self,
+        cache_key: Optional[tuple],
+        query_embedding: Optional[List[float]],
+        results: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Cache results under the key when one was computed and return a copy."""
+
+        if cache_key is None:
+            return results
+        self._search_cache[cache_key] = results
+        vector = self._unit_vector(query_embedding)
+        if vector is not None:
+            scope = self._semantic_scope(cache_key, vector)
+            semantic_cache = self._semantic_caches.get(scope)
+            if semantic_cache is None:
+                semantic_cache = self._semantic_caches[scope] = _SemanticCache(
+                    len(vector), self._semantic_cache_threshold
+                )
+            semantic_cache.store(vector, results)
+        return list(results)
+
+    @staticmethod
+    def _semantic_scope(cache_key: tuple, vector: np.ndarray) -> tuple:
+        """Only match queries of the same kind, search text, top_k and embedding size."""
+
+        kind, _, top_k, search_text = cache_key
+        # Keyword terms change hybrid scoring, so similar vectors alone are not enough.
+        return (kind, " ".join(search_text.lower().split()), top_k, vector.size)
+
+    def _unit_vector(self, query_embedding: List[float]) -> Optional[np.ndarray]:
+        """L2-normalize the embedding, or return None when semantic caching is off."""
+
+        if self._semantic_cache_threshold > 1:
+            return None
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if not norm:
+            return None
+        return vector / norm
+
+    @staticmethod
+    def _is_field_change_conflict(exc: HttpResponseError) -> bool:
+        """Return True when the service rejected a change to an existing field."""
+
+        message = str(exc)
+        return "CannotChangeExistingField" in message or "cannot be changed" in message
+
+    def _build_index_schema(self, compact_vectors: bool = True) -> SearchIndex:
+        """Build the index schema; compact_vectors=False keeps the legacy vector field."""
 
         fields = [
             SimpleField(name="id", type=SearchFieldDataType.String, key=True),
             SearchableField(name="title", type=SearchFieldDataType.String),
             SearchableField(name="content", type=SearchFieldDataType.String),
             SearchableField(name="metadata", type=SearchFieldDataType.String),
+            SimpleField(
+                name="parent_id",
+                type=SearchFieldDataType.String,
+                filterable=True,
+                facetable=True,
+            ),
+            SimpleField(name="chunk_index", type=SearchFieldDataType.Int32, filterable=True),
             SearchField(
                 name="embedding",
                 type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
                 searchable=True,
+                # Search only scores against the vectors, so drop the retrievable copy.
+                retrievable=False,
+                # The stored flag is fixed once the field exists, so only new
+                # indexes drop the stored copy.
+                stored=False if compact_vectors else None,
                 vector_search_dimensions=self._embedding_dimensions,
                 vector_search_profile_name="vector-profile",
             ),
         ]
 
         vector_search = VectorSearch(
-            algorithms=[HnswAlgorithmConfiguration(name="hnsw-config")],
+            # Explicit HNSW settings: a smaller efSearch than the service default
+            # trades a little recall for lower query latency.
+            algorithms=[
+                HnswAlgorithmConfiguration(name="hnsw-config", parameters=self._hnsw_parameters)
+            ],
+            # int8 scalar quantization shrinks the vector index about 4x; the top
+            # candidates are oversampled and rescored with the original vectors.
+            compressions=[
+                ScalarQuantizationCompression(
+                    compression_name="sq-config",
+                    rescoring_options=RescoringOptions(
+                        enable_rescoring=True,
+                        default_oversampling=2.0,
+                    ),
+                )
+            ]
+            if compact_vectors
+            else None,
             profiles=[
                 VectorSearchProfile(
                     name="vector-profile",
                     algorithm_configuration_name="hnsw-config",
+                    compression_name="sq-config" if compact_vectors else None,
                 )
             ],
         )
@@ -346,8 +794,9 @@ class AzureSearchService:
         """Normalize search results into a consistent dictionary format."""
 
         normalized: List[Dict[str, Any]] = []
-        async for result in results:
-            document = dict(result)
+        append = normalized.append
+        # The SDK already yields a fresh dict per hit and it is only read here.
+        async for document in results:
             content = (
                 document.get("content")
                 or document.get("chunk")
@@ -357,35 +806,16 @@ class AzureSearchService:
             title = document.get("title") or document.get("source") or document.get("id")
             score = document.get("@search.score")
 
-            raw_metadata = document.get("metadata")
-            parsed_metadata: Dict[str, Any] = {}
-            if isinstance(raw_metadata, str):
-                try:
-                    parsed_metadata = json.loads(raw_metadata)
-                except json.JSONDecodeError:
-                    parsed_metadata = {"raw_metadata": raw_metadata}
-            elif isinstance(raw_metadata, dict):
-                parsed_metadata = raw_metadata
-
+            parsed_metadata = self._parse_metadata(document.get("metadata"))
             metadata = {
                 key: value
                 for key, value in document.items()
-                if key
-                not in {
-                    "content",
-                    "chunk",
-                    "text",
-                    "title",
-                    "source",
-                    "@search.score",
-                    "id",
-                    "metadata",
-                }
+                if key not in _RESERVED_RESULT_KEYS
             }
             if parsed_metadata:
                 metadata.update(parsed_metadata)
 
-            normalized.append(
+            append(
                 {
                     "id": document.get("id"),
                     "content": content,
@@ -398,11 +828,58 @@ class AzureSearchService:
         return normalized
 
     @staticmethod
-    def _normalize_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    def _upload_batches(documents: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split documents into batches within the indexing request limits."""
+
+        batches: List[List[Dict[str, Any]]] = []
+        batch: List[Dict[str, Any]] = []
+        batch_bytes = 0
+        for document in documents:
+            size = len(orjson.dumps(document))
+            if batch and (
+                len(batch) >= UPLOAD_BATCH_SIZE or batch_bytes + size > UPLOAD_BATCH_BYTES
+            ):
+                batches.append(batch)
+                batch, batch_bytes = [], 0
+            batch.append(document)
+            batch_bytes += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def _parse_metadata(raw_metadata: Any) -> Any:
+        """Decode the metadata JSON string stored on each chunk."""
+
+        if isinstance(raw_metadata, dict):
+            return raw_metadata
+        if not isinstance(raw_metadata, str):
+            return {}
+        try:
+            return orjson.loads(raw_metadata)
+        except orjson.JSONDecodeError:
+            pass
+        # json also accepts the NaN and Infinity literals that orjson rejects.
+        try:
+            return json.loads(raw_metadata)
+        except json.JSONDecodeError:
+            return {"raw_metadata": raw_metadata}
+
+    @staticmethod
+    def _normalize_document(
+        document: Dict[str, Any], keep_parent_fields: bool = True
+    ) -> Dict[str, Any]:
         """Ensure documents conform to the expected index schema."""
 
+        if not keep_parent_fields and not _PARENT_FIELDS.isdisjoint(document):
+            # The index would reject unknown fields; metadata still carries both values.
+            document = {
+                key: value for key, value in document.items() if key not in _PARENT_FIELDS
+            }
+        metadata = document.get("metadata")
+        if not isinstance(metadata, (dict, list)):
+            return document
+        # Copy only when rewriting a field so callers' documents stay untouched.
         normalized = dict(document)
-        metadata = normalized.get("metadata")
-        if isinstance(metadata, (dict, list)):
-            normalized["metadata"] = json.dumps(metadata)
+        normalized["metadata"] = orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS).decode()
         return normalized
@@ -1,17 +1,18 @@
 """Utilities for extracting and chunking text from uploaded files."""
 
 from __future__ import annotations
-import io
 
+import io
 import re
-from typing import Dict, List, Optional
+from bisect import bisect_right
+from typing import BinaryIO, Dict, List, Optional, Union
 
 from azure.ai.formrecognizer.aio import DocumentAnalysisClient
 from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import AzureError
 from docx import Document
 
-from app.config.config import settings
+from app.config.config import get_settings
 
 
 class PDFExtractionError(RuntimeError):
@@ -26,9 +27,49 @@ class FormRecognizerServiceError(PDFExtractionError):
     """Raised when Azure Form Recognizer request fails."""
 
 
-async def extract_text_from_pdf(file_bytes: bytes) -> str:
+# Extracted text is normalized once per upload, so patterns are compiled once.
+_TRANSLATE_LINE_BREAKS = str.maketrans({"\u200b": None, "\ufeff": None, "\r": "\n"})
+_RE_TRAILING_WS = re.compile(r"[ \t]+\n")
+_RE_BLANK_RUN = re.compile(r"\n{3,}")
+# Heading detection runs on every line of every upload.
+_RE_SECTION_HEADING = re.compile(r"(?:part|section|chapter)\s+\d+[a-z]?\s*:")
+_RE_NUMBERED_HEADING = re.compile(r"\d+(?:\.\d+)*[\.)]?\s+[A-Za-z]")
+_SECTION_HEADING_WORDS = ("part", "section", "chapter")
+
+# Extractors accept raw bytes or a binary file-like object positioned at the start.
+FileData = Union[bytes, BinaryIO]
+
+
+# One Form Recognizer client is reused so each PDF skips the session and TLS setup.
+_form_recognizer_client: Optional[DocumentAnalysisClient] = None
+
+
+def _get_form_recognizer_client(endpoint: str, key: str) -> DocumentAnalysisClient:
+    """Return the shared Form Recognizer client, creating it on first use."""
+
+    # Construction never awaits, so concurrent uploads cannot race to build two.
+    global _form_recognizer_client
+    if _form_recognizer_client is None:
+        _form_recognizer_client = DocumentAnalysisClient(
+            endpoint=endpoint,
+            credential=AzureKeyCredential(key),
+        )
+    return _form_recognizer_client
+
+
+async def close_form_recognizer() -> None:
+    """Close the shared Form Recognizer client, e.g. on application shutdown."""
+
+    global _form_recognizer_client
+    client, _form_recognizer_client = _form_recognizer_client, None
+    if client is not None:
+        await client.close()
+
+
+async def extract_text_from_pdf(file_data: FileData) -> str:
     """Extract text from a PDF using Azure Form Recognizer prebuilt-layout."""
 
+    settings = get_settings()
     endpoint = settings.azure_form_recognizer_endpoint.strip()
     key = settings.azure_form_recognizer_key.strip()
     if not endpoint or not key:
@@ -36,13 +77,9 @@ async def extract_text_from_pdf(file_bytes: bytes) -> str:
             "PDF extraction requires AZURE_FORM_RECOGNIZER_ENDPOINT and AZURE_FORM_RECOGNIZER_KEY."
         )
 
-    client: Optional[DocumentAnalysisClient] = None
     try:
-        client = DocumentAnalysisClient(
-            endpoint=endpoint,
-            credential=AzureKeyCredential(key),
-        )
-        poller = await client.begin_analyze_document("prebuilt-layout", file_bytes)
+        client = _get_form_recognizer_client(endpoint, key)
+        poller = await client.begin_analyze_document("prebuilt-layout", file_data)
         result = await poller.result()
     except AzureError as exc:
         raise FormRecognizerServiceError(
@@ -52,22 +89,12 @@ async def extract_text_from_pdf(file_bytes: bytes) -> str:
         raise FormRecognizerServiceError(
             "Unexpected error during Azure Form Recognizer PDF extraction."
         ) from exc
-    finally:
-        if client is not None:
-            await client.close()
 
     text = (getattr(result, "content", None) or "").strip()
     if not text:
-        page_blocks: List[str] = []
-        for page in getattr(result, "pages", []) or []:
-            lines = []
-            for line in getattr(page, "lines", []) or []:
-                content = str(getattr(line, "content", "")).strip()
-                if content:
-                    lines.append(content)
-            if lines:
-                page_blocks.append("\n".join(lines))
-        text = "\n\n".join(page_blocks).strip()
+        page_texts = (_page_text(page) for page in getattr(result, "pages", []) or [])
+        # Pages without any line content are skipped rather than left as blank blocks.
+        text = "\n\n".join(filter(None, page_texts)).strip()
 
     text = _normalize_extracted_text(text)
     if not text:
@@ -75,27 +102,39 @@ async def extract_text_from_pdf(file_bytes: bytes) -> str:
     return text
 
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
+def _page_text(page) -> str:
+    """Join the non-empty lines of a Form Recognizer page."""
+
+    lines = (str(getattr(line, "content", "")).strip() for line in getattr(page, "lines", []) or [])
+    return "\n".join(filter(None, lines))
+
+
+def extract_text_from_docx(file_data: FileData) -> str:
     """Extract text from a DOCX file."""
 
-    document = Document(io.BytesIO(file_bytes))
+    if isinstance(file_data, bytes):
+        file_data = io.BytesIO(file_data)
+    document = Document(file_data)
     return "\n".join(paragraph.text for paragraph in document.paragraphs)
 
 
-def extract_text_from_txt(file_bytes: bytes) -> str:
+def extract_text_from_txt(file_data: FileData) -> str:
     """Extract text from a plain text file."""
 
-    return file_bytes.decode("utf-8", errors="ignore")
+    if not isinstance(file_data, bytes):
+        file_data = file_data.read()
+    return file_data.decode("utf-8", errors="ignore")
 
 
 def _normalize_extracted_text(text: str) -> str:
     """Normalize extraction output while preserving paragraph boundaries."""
 
-    normalized = text.replace("\r\n", "\n").replace("\r", "\n")
-    normalized = normalized.replace("\u200b", "").replace("\ufeff", "")
-    normalized = re.sub(r"[ \t]+\n", "\n", normalized)
-    normalized = re.sub(r"\n[ \t]+\n", "\n\n", normalized)
-    normalized = re.sub(r"\n{3,}", "\n\n", normalized)
+    # Replace \r\n first so the translate table's \r -> \n does not double breaks.
+    normalized = text.replace("\r\n", "\n").translate(_TRANSLATE_LINE_BREAKS)
+    # Stripping trailing blanks also empties whitespace-only lines, so a separate
+    # pass for those is not needed before collapsing blank runs.
+    normalized = _RE_TRAILING_WS.sub("\n", normalized)
+    normalized = _RE_BLANK_RUN.sub("\n\n", normalized)
     return normalized.strip()
 
 
@@ -112,7 +151,7 @@ def _detect_heading(line: str) -> Optional[str]:
     if not candidate:
         return None
 
-    if candidate[0] in {"-", "*", "•"}:
+    if candidate[0] in "-*•":
         return None
 
     if len(candidate) > 140:
@@ -123,14 +162,16 @@ def _detect_heading(line: str) -> Optional[str]:
     if word_count == 0 or word_count > 14:
         return None
 
-    lower = stripped.lower()
-    if re.match(r"^(part|section|chapter)\s+\d+[a-z]?\s*:", lower):
-        return stripped
+    # Cheap first-character tests decide which pattern, if any, can match.
+    first = stripped[0]
+    if first.isdigit():
+        if _RE_NUMBERED_HEADING.match(stripped):
+            return stripped
+    elif stripped[:7].lower().startswith(_SECTION_HEADING_WORDS):
+        if _RE_SECTION_HEADING.match(stripped.lower()):
+            return stripped
 
-    if re.match(r"^\d+(?:\.\d+)*[\.)]?\s+[A-Za-z].*$", stripped):
-        return stripped
-
-    if stripped.isupper() and word_count <= 10:
+    if word_count <= 10 and not first.islower() and stripped.isupper():
         return stripped
 
     return None
@@ -142,53 +183,31 @@ def chunk_text_with_metadata(text: str, chunk_size: int = 500) -> List[Dict[str,
     if chunk_size <= 0:
         raise ValueError("chunk_size must be positive")
 
-    lines = text.splitlines()
-    if not lines:
-        return []
+    # Collect every word once, remembering where each detected heading starts.
+    words: List[str] = []
+    heading_starts: List[int] = []
+    heading_names: List[str] = []
+    for raw_line in text.splitlines():
+        line_words = raw_line.split()
+        if not line_words:
+            continue
+        heading = _detect_heading(raw_line)
+        if heading:
+            heading_starts.append(len(words))
+            heading_names.append(heading)
+        words.extend(line_words)
 
     chunks: List[Dict[str, Optional[str]]] = []
-    chunk_words: List[str] = []
-    chunk_section: Optional[str] = None
-    current_section: Optional[str] = None
-
-    def flush_chunk() -> None:
-        nonlocal chunk_words, chunk_section
-        if not chunk_words:
-            return
+    for start in range(0, len(words), chunk_size):
+        # A chunk belongs to the last heading seen before its first word.
+        heading_idx = bisect_right(heading_starts, start) - 1
         chunks.append(
             {
-                "content": " ".join(chunk_words).strip(),
-                "section_name": chunk_section,
+                "content": " ".join(words[start : start + chunk_size]),
+                "section_name": heading_names[heading_idx] if heading_idx >= 0 else None,
             }
         )
-        chunk_words = []
-        chunk_section = None
-
-    for raw_line in lines:
-        line = _normalize_line(raw_line)
-        if not line:
-            continue
-
-        heading = _detect_heading(line)
-        if heading:
-            current_section = heading
-
-        words = line.split()
-        idx = 0
-        while idx < len(words):
-            if not chunk_words:
-                chunk_section = current_section
-
-            remaining = chunk_size - len(chunk_words)
-            take = words[idx : idx + remaining]
-            chunk_words.extend(take)
-            idx += len(take)
-
-            if len(chunk_words) >= chunk_size:
-                flush_chunk()
-
-    flush_chunk()
-    return [item for item in chunks if item.get("content")]
+    return chunks
 
 
 def chunk_text(text: str, chunk_size: int = 500) -> List[str]:
@@ -1,18 +1,46 @@
 """Logging utilities for consistent application output."""
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_queue_listener: Optional[QueueListener] = None
+_configured = False
+
+
+def _configure_root_logger() -> None:
+    """Attach a queue handler so log writes happen on a background thread."""
+
+    global _queue_listener
+    root = logging.getLogger()
+    if _queue_listener is not None or root.handlers:
+        # Already configured here or by the host (e.g. Azure Functions).
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    _queue_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)
 
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """Create or retrieve a logger with basic configuration."""
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-    )
-    logging.getLogger("azure.core.pipeline.policies.http_logging_policy").setLevel(
-        logging.WARNING
-    )
-    logging.getLogger("azure.search.documents").setLevel(logging.WARNING)
+    global _configured
+    if not _configured:
+        # Every module calls this at import; configure only on the first call.
+        _configure_root_logger()
+        logging.getLogger("azure.core.pipeline.policies.http_logging_policy").setLevel(
+            logging.WARNING
+        )
+        logging.getLogger("azure.search.documents").setLevel(logging.WARNING)
+        _configured = True
     return logging.getLogger(name)
@@ -39,3 +39,18 @@ Context Documents:
 Question: {question}
 
 Remember: Answer ONLY from the context above. All [Source: ...] citations must appear ONLY in the Sources block at the very end — never inline."""
+
+# Split once at import so filling the strict prompt is plain concatenation.
+_STRICT_PREFIX, _context_sep, _strict_rest = STRICT_RAG_SYSTEM_PROMPT.partition("{context}")
+_STRICT_MIDDLE, _question_sep, _STRICT_SUFFIX = _strict_rest.partition("{question}")
+# Fall back to str.format if the template is ever edited to drop or reorder a slot.
+_STRICT_PRESPLIT = bool(_context_sep and _question_sep)
+
+
+def render_strict_prompt(context: str, question: str) -> str:
+    """Fill STRICT_RAG_SYSTEM_PROMPT without re-parsing the template."""
+
+    if not _STRICT_PRESPLIT:
+        return STRICT_RAG_SYSTEM_PROMPT.format(context=context, question=question)
+    # One join copies the (possibly large) context once; chained + copies it per step.
+    return "".join((_STRICT_PREFIX, context, _STRICT_MIDDLE, question, _STRICT_SUFFIX))
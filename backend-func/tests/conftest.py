@@ -0,0 +1,236 @@
+"""Shared fixtures for backend tests."""
+
+from __future__ import annotations
+
+import json
+import re
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+from azure.core.exceptions import HttpResponseError
+
+from app.config import config
+from app.services import openai_service
+from app.services.search_service import AzureSearchService
+
+TEST_CREDENTIALS = {
+    "AZURE_SEARCH_SERVICE_ENDPOINT": "https://example.search.windows.net",
+    "AZURE_SEARCH_ADMIN_KEY": "test-key",
+    "AZURE_SEARCH_INDEX_NAME": "test-index",
+    "AZURE_OPENAI_ENDPOINT": "https://example.openai.azure.com",
+    "AZURE_OPENAI_API_KEY": "test-key",
+    "AZURE_OPENAI_DEPLOYMENT_NAME": "test-chat",
+    "AZURE_OPENAI_API_VERSION": "2024-02-01",
+    "AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME": "test-embedding",
+}
+
+_RE_PARENT_FILTER = re.compile(r"^parent_id eq '(.*)'$")
+_RE_CHUNK_FILTER = re.compile(r"^chunk_index eq (\d+)$")
+
+
+class WordEncoding:
+    """Offline stand-in for the tiktoken encoding: one token per word."""
+
+    def __init__(self) -> None:
+        self.encoded: List[str] = []
+
+    def encode(self, text: str) -> List[str]:
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_batch(self, texts: List[str], num_threads: int = 8) -> List[List[str]]:
+        return [self.encode(text) for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def test_credentials(monkeypatch: pytest.MonkeyPatch):
+    """Replace the hardcoded credentials with placeholders for each test."""
+
+    monkeypatch.setattr(config, "CREDENTIALS", TEST_CREDENTIALS)
+    config.get_settings.cache_clear()
+    yield
+    config.get_settings.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def word_encoding(monkeypatch: pytest.MonkeyPatch) -> WordEncoding:
+    """Avoid downloading the tiktoken vocabulary when services are constructed."""
+
+    encoding = WordEncoding()
+    monkeypatch.setattr(openai_service, "_cl100k", lambda: encoding)
+    return encoding
+
+
+class FakeSearchResults:
+    """Async iterator over hits that also reports facets and the total count."""
+
+    def __init__(
+        self,
+        items: List[Dict[str, Any]],
+        facets: Optional[Dict[str, Any]] = None,
+        count: int = 0,
+    ) -> None:
+        self._items = items
+        self._facets = facets
+        self._count = count
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for item in self._items:
+            yield item
+
+    async def get_facets(self) -> Optional[Dict[str, Any]]:
+        return self._facets
+
+    async def get_count(self) -> int:
+        return self._count
+
+
+class FakeSearchClient:
+    """In-memory search client covering the filters and facets the service sends."""
+
+    def __init__(
+        self, docs: Optional[List[Dict[str, Any]]] = None, parent_fields: bool = True
+    ) -> None:
+        self.docs: List[Dict[str, Any]] = list(docs or [])
+        self.parent_fields = parent_fields
+        self.calls: List[Dict[str, Any]] = []
+        self.uploaded: List[Dict[str, Any]] = []
+
+    async def search(
+        self,
+        search_text: str = "*",
+        filter: Optional[str] = None,
+        select: Optional[List[str]] = None,
+        top: Optional[int] = 50,
+        skip: int = 0,
+        facets: Optional[List[str]] = None,
+        search_fields: Optional[List[str]] = None,
+        **options: Any,
+    ) -> FakeSearchResults:
+        self.calls.append(
+            {
+                "search_text": search_text,
+                "filter": filter,
+                "select": select,
+                "top": top,
+                "skip": skip,
+                "facets": facets,
+                "search_fields": search_fields,
+                **options,
+            }
+        )
+        if not self.parent_fields and (filter or facets):
+            # Azure rejects expressions on fields the index does not define.
+            raise HttpResponseError(
+                message="Invalid expression: Could not find a property named 'parent_id'"
+            )
+
+        docs = list(self.docs)
+        if filter:
+            parent = _RE_PARENT_FILTER.match(filter)
+            if parent:
+                value = parent.group(1).replace("''", "'")
+                docs = [doc for doc in docs if doc.get("parent_id") == value]
+            else:
+                index = int(_RE_CHUNK_FILTER.match(filter).group(1))
+                docs = [doc for doc in docs if doc.get("chunk_index") == index]
+        if search_fields == ["metadata"]:
+            term = search_text.strip('"')
+            docs = [doc for doc in docs if term in (doc.get("metadata") or "")]
+        elif search_text != "*":
+            terms = search_text.lower().split()
+            docs = [
+                doc
+                for doc in docs
+                if any(term in doc.get("content", "").lower() for term in terms)
+            ]
+
+        facet_values = None
+        if facets:
+            counts: Dict[str, int] = {}
+            for doc in docs:
+                if doc.get("parent_id"):
+                    counts[doc["parent_id"]] = counts.get(doc["parent_id"], 0) + 1
+            facet_values = {
+                "parent_id": [{"value": key, "count": value} for key, value in counts.items()]
+            }
+
+        hits = []
+        for doc in docs[skip : skip + top] if top else []:
+            hit = {key: value for key, value in doc.items() if not select or key in select}
+            hit["@search.score"] = 1.0
+            hits.append(hit)
+        return FakeSearchResults(hits, facet_values, len(docs))
+
+    async def upload_documents(self, documents: List[Dict[str, Any]]) -> List[Any]:
+        self.uploaded.extend(documents)
+        self.docs.extend(documents)
+        return [SimpleNamespace(succeeded=True) for _ in documents]
+
+    async def delete_documents(self, documents: List[Dict[str, Any]]) -> List[Any]:
+        ids = {document["id"] for document in documents}
+        self.docs = [doc for doc in self.docs if doc["id"] not in ids]
+        return [SimpleNamespace(succeeded=True) for _ in documents]
+
+
+class FakeIndexClient:
+    """Index client that reports a schema with or without the parent fields."""
+
+    def __init__(self, parent_fields: bool = True) -> None:
+        names = ["id", "title", "content", "metadata", "embedding"]
+        fields = [SimpleNamespace(name=name, filterable=False, facetable=False) for name in names]
+        if parent_fields:
+            fields.append(SimpleNamespace(name="parent_id", filterable=True, facetable=True))
+            fields.append(SimpleNamespace(name="chunk_index", filterable=True, facetable=False))
+        self._index = SimpleNamespace(fields=fields)
+
+    async def get_index(self, name: str) -> SimpleNamespace:
+        return self._index
+
+    async def get_index_statistics(self, name: str) -> Dict[str, Any]:
+        return {}
+
+
+def make_chunk(
+    parent_id: str, chunk_index: int, legacy: bool = False, **fields: Any
+) -> Dict[str, Any]:
+    """Build an indexed chunk; legacy chunks keep parent fields only in metadata."""
+
+    metadata = {"parent_id": parent_id, "filename": f"{parent_id}.txt", "chunk_index": chunk_index}
+    chunk = {
+        "id": f"{parent_id}-{chunk_index:06d}",
+        "title": f"{parent_id}.txt",
+        "content": f"content of {parent_id} chunk {chunk_index}",
+        "metadata": json.dumps(metadata),
+        **fields,
+    }
+    if not legacy:
+        chunk["parent_id"] = parent_id
+        chunk["chunk_index"] = chunk_index
+    return chunk
+
+
+@pytest.fixture
+def make_search_service() -> Callable[..., Tuple[AzureSearchService, FakeSearchClient]]:
+    """Build a search service over in-memory documents and a pre-provisioned index."""
+
+    def factory(
+        docs: Optional[List[Dict[str, Any]]] = None,
+        parent_fields: bool = True,
+        semantic_cache_threshold: Optional[float] = None,
+    ) -> Tuple[AzureSearchService, FakeSearchClient]:
+        service = AzureSearchService()
+        client = FakeSearchClient(docs, parent_fields=parent_fields)
+        service._search_client = client
+        service._index_client = FakeIndexClient(parent_fields=parent_fields)
+        service._auto_create_index = False
+        service._use_semantic = False
+        if semantic_cache_threshold is not None:
+            service._semantic_cache_threshold = semantic_cache_threshold
+        return service, client
+
+    return factory
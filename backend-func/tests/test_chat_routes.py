@@ -0,0 +1,76 @@
+"""Tests for the document listing and deletion routes."""
+
+from __future__ import annotations
+
+import asyncio
+
+import orjson
+import pytest
+
+from tests.conftest import make_chunk
+
+
+@pytest.fixture
+def install_search_service(monkeypatch: pytest.MonkeyPatch, make_search_service):
+    """Swap the routes' search service for one over in-memory documents."""
+
+    from app.routes import chat_routes
+
+    def install(docs, parent_fields: bool = True):
+        service, client = make_search_service(docs, parent_fields=parent_fields)
+        monkeypatch.setattr(chat_routes, "search_service", service)
+        return chat_routes, client
+
+    return install
+
+
+def _list_documents(routes) -> dict:
+    return orjson.loads(asyncio.run(routes.list_documents()).body)
+
+
+def test_list_and_delete_without_parent_fields(install_search_service) -> None:
+    """Ensure an index without parent fields lists and deletes through the metadata."""
+
+    docs = [make_chunk("p1", index, legacy=True) for index in range(3)]
+    docs.append(make_chunk("p2", 0, legacy=True))
+    routes, client = install_search_service(docs, parent_fields=False)
+
+    listing = _list_documents(routes)
+    counts = {doc["id"]: doc["metadata"]["chunk_count"] for doc in listing["documents"]}
+    assert counts == {"p1": 3, "p2": 1}
+    assert listing["chunk_count"] == 4
+
+    asyncio.run(routes.delete_document("p1"))
+    assert [doc["id"] for doc in client.docs] == ["p2-000000"]
+
+
+def test_documents_from_facets_when_facets_cover_index(install_search_service) -> None:
+    """Ensure listing uses the facets when every chunk carries a parent_id."""
+
+    docs = [make_chunk("p1", index) for index in range(2)] + [make_chunk("p2", 0)]
+    routes, client = install_search_service(docs)
+
+    documents, total_count = asyncio.run(routes._documents_from_facets())
+
+    assert total_count == 3
+    assert sorted((doc["id"], doc["metadata"]["chunk_count"]) for doc in documents) == [
+        ("p1", 2),
+        ("p2", 1),
+    ]
+    # Only the facet query and the first-chunk title lookup, no full scan.
+    assert all(call["facets"] or call["filter"] for call in client.calls)
+
+
+def test_documents_from_facets_defers_mixed_index_to_scan(install_search_service) -> None:
+    """Ensure legacy chunks missing from the facets trigger the full scan."""
+
+    docs = [make_chunk("p1", 0)] + [make_chunk("p2", index, legacy=True) for index in range(2)]
+    routes, _ = install_search_service(docs)
+
+    documents, total_count = asyncio.run(routes._documents_from_facets())
+    assert documents is None
+    assert total_count == 3
+
+    listing = _list_documents(routes)
+    counts = {doc["id"]: doc["metadata"]["chunk_count"] for doc in listing["documents"]}
+    assert counts == {"p1": 1, "p2": 2}
@@ -0,0 +1,38 @@
+"""Tests for local token counting."""
+
+from __future__ import annotations
+
+from app.services.openai_service import TOKEN_CACHE_MAX_TEXT_LENGTH, AzureOpenAIService
+
+
+def test_repeated_message_counts_are_served_from_cache(word_encoding) -> None:
+    """Ensure counting the same short messages twice only encodes them once."""
+
+    service = AzureOpenAIService()
+    messages = [
+        {"role": "system", "content": "You answer from context"},
+        {"role": "user", "content": "What is the refund policy"},
+    ]
+
+    assert service._count_tokens(messages) == 9
+    encoded = len(word_encoding.encoded)
+    assert service._count_tokens(messages) == 9
+    assert len(word_encoding.encoded) == encoded
+
+
+def test_long_messages_bypass_cache(word_encoding) -> None:
+    """Ensure texts over the cache limit are counted directly every time."""
+
+    service = AzureOpenAIService()
+    long_text = "word " * (TOKEN_CACHE_MAX_TEXT_LENGTH // 5 + 1)
+    messages = [
+        {"role": "system", "content": long_text},
+        {"role": "system", "content": long_text},
+        {"role": "user", "content": "short question"},
+    ]
+
+    expected = 2 * len(long_text.split()) + 2
+    assert service._count_tokens(messages) == expected
+    assert service._count_tokens(messages) == expected
+    assert word_encoding.encoded.count(long_text) == 4
+    assert word_encoding.encoded.count("short question") == 1
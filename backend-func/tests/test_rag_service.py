@@ -0,0 +1,166 @@
+"""Tests for the RAG pipeline with in-memory search and OpenAI services."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.services.rag_service import RAGService
+
+from tests.conftest import make_chunk
+
+
+class _FakeSearchService:
+    """Return fixed chunks for every hybrid search and record the calls."""
+
+    def __init__(self, docs: List[Dict[str, Any]], text_delay: float = 0.0) -> None:
+        self.docs = docs
+        self.text_delay = text_delay
+        self.calls: List[Optional[List[float]]] = []
+
+    async def hybrid_search(
+        self, query_text: str, query_embedding: Optional[List[float]], top_k: int
+    ) -> List[Dict[str, Any]]:
+        self.calls.append(query_embedding)
+        if query_embedding is None:
+            await asyncio.sleep(self.text_delay)
+        return [dict(doc, vector=query_embedding is not None) for doc in self.docs]
+
+
+class _FakeOpenAIService:
+    """Answer every prompt with the same text and a fixed token usage."""
+
+    def __init__(self, embedding: Optional[List[float]] = None, delay: float = 0.0) -> None:
+        self.embedding = embedding if embedding is not None else [0.1, 0.2]
+        self.delay = delay
+        self.completions = 0
+
+    async def generate_embedding(self, text: str) -> List[float]:
+        await asyncio.sleep(self.delay)
+        return self.embedding
+
+    async def chat_completion(self, **_: Any) -> tuple:
+        self.completions += 1
+        return "Refunds are processed within five days.", 42
+
+
+def _search_results(parent_id: str = "p1") -> List[Dict[str, Any]]:
+    chunk = make_chunk(parent_id, 0)
+    return [
+        {
+            "id": chunk["id"],
+            "title": chunk["title"],
+            "content": chunk["content"],
+            "score": 0.9,
+            "metadata": {"parent_id": parent_id},
+        }
+    ]
+
+
+def _rag_service(search: Any, openai: Any, hedge_seconds: float = 1.0) -> RAGService:
+    service = RAGService(search_service=search, openai_service=openai, relevance_threshold=0.0)
+    service._embedding_hedge_seconds = hedge_seconds
+    return service
+
+
+def test_response_cache_hits_and_misses() -> None:
+    """Ensure identical requests reuse the answer and its usage, other settings do not."""
+
+    openai = _FakeOpenAIService()
+    service = _rag_service(_FakeSearchService(_search_results()), openai)
+
+    async def run() -> None:
+        first = await service.process_query("refund policy", temperature=0.25)
+        repeat = await service.process_query("refund  policy", temperature=0.25)
+        assert openai.completions == 1
+        assert repeat["answer"] == first["answer"]
+        assert repeat["tokens_used"] == first["tokens_used"] == 42
+
+        await service.process_query("refund policy", temperature=0.3)
+        assert openai.completions == 2
+        await service.process_query("refund policy", temperature=0.25, max_tokens=256)
+        assert openai.completions == 3
+
+    asyncio.run(run())
+
+
+def test_invalidate_for_doc_id_drops_cached_answers() -> None:
+    """Ensure deleting a file or chunk forces the next answer to be regenerated."""
+
+    openai = _FakeOpenAIService()
+    service = _rag_service(_FakeSearchService(_search_results("p1")), openai)
+    chunk_id = _search_results("p1")[0]["id"]
+
+    async def run() -> None:
+        await service.process_query("refund policy")
+        assert service.invalidate_for_doc_id("other") == 0
+        assert service.invalidate_for_doc_id("p1") == 1
+        await service.process_query("refund policy")
+        assert openai.completions == 2
+
+        assert service.invalidate_for_doc_id(chunk_id) == 1
+        await service.process_query("refund policy")
+        assert openai.completions == 3
+
+    asyncio.run(run())
+
+
+def test_retrieve_uses_embedding_that_arrives_in_time() -> None:
+    """Ensure an embedding ready before the hedge deadline runs one vector search."""
+
+    search = _FakeSearchService(_search_results())
+    service = _rag_service(search, _FakeOpenAIService())
+
+    results = asyncio.run(service._retrieve("refund policy", 3))
+
+    assert results[0]["vector"] is True
+    assert search.calls == [[0.1, 0.2]]
+
+
+def test_retrieve_returns_text_results_when_hedge_wins() -> None:
+    """Ensure a slow embedding is cancelled once the text-only search finishes first."""
+
+    search = _FakeSearchService(_search_results())
+    service = _rag_service(search, _FakeOpenAIService(delay=10), hedge_seconds=0.01)
+
+    async def run() -> None:
+        results = await service._retrieve("refund policy", 3)
+        assert results[0]["vector"] is False
+        assert search.calls == [None]
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        await asyncio.sleep(0)
+        assert all(task.done() for task in pending)
+
+    asyncio.run(run())
+
+
+def test_retrieve_falls_back_to_text_results_on_empty_embedding() -> None:
+    """Ensure an empty embedding that arrives after the hedge uses the text search."""
+
+    search = _FakeSearchService(_search_results(), text_delay=0.05)
+    openai = _FakeOpenAIService(embedding=[], delay=0.02)
+    service = _rag_service(search, openai, hedge_seconds=0.01)
+
+    results = asyncio.run(service._retrieve("refund policy", 3))
+
+    assert results[0]["vector"] is False
+    assert search.calls == [None]
+
+
+def test_retrieve_cancels_speculative_tasks_when_caller_is_cancelled() -> None:
+    """Ensure a cancelled request does not leave the embedding or hedge running."""
+
+    search = _FakeSearchService(_search_results(), text_delay=10)
+    service = _rag_service(search, _FakeOpenAIService(delay=10), hedge_seconds=0.01)
+
+    async def run() -> None:
+        request = asyncio.ensure_future(service._retrieve("refund policy", 3))
+        await asyncio.sleep(0.05)
+        assert search.calls == [None]
+        request.cancel()
+        await asyncio.gather(request, return_exceptions=True)
+        await asyncio.sleep(0)
+        others = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        assert others == []
+
+    asyncio.run(run())
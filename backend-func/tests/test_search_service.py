@@ -0,0 +1,133 @@
+"""Tests for the Azure Search service against an in-memory search client."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.services.search_service import AzureSearchService
+
+from tests.conftest import make_chunk
+
+
+def test_hybrid_queries_with_different_text_do_not_share_results(make_search_service) -> None:
+    """Ensure a near-identical embedding only reuses results for the same search text."""
+
+    docs = [
+        {"id": "pricing", "title": "pricing.txt", "content": "Azure pricing tiers"},
+        {"id": "holidays", "title": "holidays.txt", "content": "Holiday policy"},
+    ]
+    service, client = make_search_service(docs, semantic_cache_threshold=0.95)
+    embedding = [0.1, 0.2, 0.3, 0.4]
+    similar = [value + 1e-4 for value in embedding]
+
+    async def run() -> None:
+        first = await service.hybrid_search("azure pricing", embedding, 3)
+        second = await service.hybrid_search("holiday policy", similar, 3)
+        assert [doc["id"] for doc in first] == ["pricing"]
+        assert [doc["id"] for doc in second] == ["holidays"]
+        assert len(client.calls) == 2
+
+        third = await service.hybrid_search("Azure  pricing", similar, 3)
+        assert [doc["id"] for doc in third] == ["pricing"]
+        assert len(client.calls) == 2
+
+    asyncio.run(run())
+
+
+def test_semantic_cache_disabled_by_default() -> None:
+    """Ensure the default threshold only reuses results for identical embeddings."""
+
+    service = AzureSearchService()
+    assert service._semantic_cache_threshold > 1
+
+
+def test_index_without_parent_fields_uses_metadata_lookups(make_search_service) -> None:
+    """Ensure upload, delete and list avoid parent_id/chunk_index on indexes lacking them."""
+
+    docs = [make_chunk("p1", 0, legacy=True), make_chunk("p1", 1, legacy=True)]
+    service, client = make_search_service(docs, parent_fields=False)
+
+    async def run() -> None:
+        await service.upload_documents(
+            [
+                {
+                    "id": "p2-000000",
+                    "title": "p2.txt",
+                    "parent_id": "p2",
+                    "chunk_index": 0,
+                    "content": "new chunk",
+                    "metadata": {"parent_id": "p2", "chunk_index": 0},
+                }
+            ]
+        )
+        assert "parent_id" not in client.uploaded[0]
+        assert "chunk_index" not in client.uploaded[0]
+        assert json.loads(client.uploaded[0]["metadata"])["parent_id"] == "p2"
+
+        assert await service.find_ids_by_parent("p1") == ["p1-000000", "p1-000001"]
+        assert await service.parent_facets() is None
+        assert all(call["filter"] is None and not call["facets"] for call in client.calls)
+
+    asyncio.run(run())
+
+
+def test_upload_keeps_top_level_parent_fields(make_search_service) -> None:
+    """Ensure chunks keep parent_id/chunk_index and serialize metadata when supported."""
+
+    service, client = make_search_service()
+    document = {
+        "id": "p1-000000",
+        "parent_id": "p1",
+        "chunk_index": 0,
+        "content": "chunk",
+        "metadata": {"parent_id": "p1", "chunk_index": 0},
+    }
+
+    asyncio.run(service.upload_documents([document]))
+
+    uploaded = client.uploaded[0]
+    assert (uploaded["parent_id"], uploaded["chunk_index"]) == ("p1", 0)
+    assert json.loads(uploaded["metadata"]) == {"parent_id": "p1", "chunk_index": 0}
+    assert isinstance(document["metadata"], dict)
+
+
+def test_find_ids_by_parent_pages_through_filter(make_search_service) -> None:
+    """Ensure the parent filter keeps paging until a short page comes back."""
+
+    docs = [make_chunk("p1", index) for index in range(5)] + [make_chunk("p2", 0)]
+    service, client = make_search_service(docs)
+
+    chunk_ids = asyncio.run(service.find_ids_by_parent("p1", batch_size=2))
+
+    assert chunk_ids == [f"p1-{index:06d}" for index in range(5)]
+    assert [call["skip"] for call in client.calls] == [0, 2, 4]
+    assert {call["filter"] for call in client.calls} == {"parent_id eq 'p1'"}
+
+
+def test_find_ids_by_parent_falls_back_to_metadata(make_search_service) -> None:
+    """Ensure chunks indexed before the parent field are matched through metadata."""
+
+    docs = [make_chunk("p1", index, legacy=True) for index in range(2)]
+    docs.append(make_chunk("p10", 0, legacy=True))
+    service, client = make_search_service(docs)
+
+    chunk_ids = asyncio.run(service.find_ids_by_parent("p1"))
+
+    assert chunk_ids == ["p1-000000", "p1-000001"]
+    assert client.calls[-1]["search_fields"] == ["metadata"]
+
+
+def test_parent_facets_counts_chunks_and_titles(make_search_service) -> None:
+    """Ensure facets count chunks per file and take titles from the first chunks."""
+
+    docs = [make_chunk("p1", index) for index in range(3)] + [make_chunk("p2", 0)]
+    service, _ = make_search_service(docs)
+
+    stats = asyncio.run(service.parent_facets())
+
+    assert stats["total_count"] == 4
+    assert sorted(stats["parents"], key=lambda parent: parent["id"]) == [
+        {"id": "p1", "title": "p1.txt", "chunk_count": 3},
+        {"id": "p2", "title": "p2.txt", "chunk_count": 1},
+    ]
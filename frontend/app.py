@@ -19,7 +19,7 @@ BACKEND_URL = os.getenv("BACKEND_URL", "https://ragchatbotbackend.azurewebsites.
 
 st.set_page_config(page_title="FairWork RAG Chatbot", layout="wide")
 
-inject_global_styles()
+inject_global_styles({"chat"})
 
 initialize_state(st.session_state)
 
@@ -74,25 +74,16 @@ if user_input and user_input.strip():
         full_response = ""
 
     if full_response.strip():
-        st.session_state.messages.append(
-            {
-                "role": "assistant",
-                "content": full_response,
-                "has_sufficient_context": has_sufficient_context,
-                "suggested_actions": suggested_actions,
-                "tokens_used": tokens_used,
-            }
-        )
+        assistant_message = {
+            "role": "assistant",
+            "content": full_response,
+            "has_sufficient_context": has_sufficient_context,
+            "suggested_actions": suggested_actions,
+            "tokens_used": tokens_used,
+        }
+        st.session_state.messages.append(assistant_message)
         with chat_container:
-            render_message(
-                {
-                    "role": "assistant",
-                    "content": full_response,
-                    "has_sufficient_context": has_sufficient_context,
-                    "suggested_actions": suggested_actions,
-                    "tokens_used": tokens_used,
-                }
-            )
+            render_message(assistant_message)
 
 
 st.markdown("</div>", unsafe_allow_html=True)
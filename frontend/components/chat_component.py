@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import html
 import re
+import threading
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import streamlit as st
 import markdown
-import bleach
+from bleach.sanitizer import Cleaner
 
 ALLOWED_TAGS = [
     "p",
@@ -37,6 +40,65 @@ ALLOWED_TAGS = [
 ]
 ALLOWED_ATTRIBUTES = {"a": ["href", "title", "target", "rel"]}
 
+# Streamlit re-renders the whole history on every rerun, so rendered HTML is
+# memoized per message content; only new messages pay for markdown + bleach.
+RENDER_CACHE_SIZE = 512
+SNIPPET_MAX_CHARS = 400
+
+_MESSAGE_TEMPLATE = (
+    "<div class='message-row {role}'>"
+    "<div class='message-bubble {role}'>"
+    "<div class='message-header'>"
+    "<span class='role-badge {role}'>{badge}</span>"
+    "<span class='role-label'>{label}</span>"
+    "</div>"
+    "<div class='message-content'>{content}</div>"
+    "</div>"
+    "</div>"
+)
+_TRANSLATE_INVISIBLE = str.maketrans({"\u200b": None, "\ufeff": None, "\u00a0": " "})
+_RE_EMPTY_PARAGRAPH = re.compile(r"<p>(?:\s|&nbsp;|&#160;|<br\s*/?>)*</p>", re.IGNORECASE)
+_RE_REPEATED_BREAKS = re.compile(r"(?:<br\s*/?>\s*){2,}", re.IGNORECASE)
+# Trailing whitespace of each line (lookbehind anchors matches at run starts).
+_RE_TRAILING_WS = re.compile(r"(?<![^\S\n])[^\S\n]+$", re.MULTILINE)
+_RE_BLANK_RUN = re.compile(r"\n{3,}")
+# Anything markdown (with the enabled extensions) or the sanitizer could act on:
+# inline syntax and escapes, control characters, or block markers at line start.
+_RE_MARKDOWN_SYNTAX = re.compile(
+    r"[\\`*_{}\[\]<>&#|~^\t\x00-\x08\x0b-\x1f\x7f]|^(?:[^\S\n]|[-+=:]|\d+[.)])",
+    re.MULTILINE,
+)
+
+# Streamlit runs each session's script on its own thread, and both the bleach
+# cleaner and the Markdown converter keep parser state, so each thread builds
+# and reuses its own.
+_thread_state = threading.local()
+
+
+def _markdown_converter() -> markdown.Markdown:
+    """Return this thread's reusable Markdown converter."""
+
+    converter = getattr(_thread_state, "markdown", None)
+    if converter is None:
+        converter = _thread_state.markdown = markdown.Markdown(
+            extensions=["fenced_code", "tables", "sane_lists"],
+            output_format="html5",
+        )
+    return converter
+
+
+def _cleaner() -> Cleaner:
+    """Return this thread's reusable bleach cleaner."""
+
+    cleaner = getattr(_thread_state, "cleaner", None)
+    if cleaner is None:
+        cleaner = _thread_state.cleaner = Cleaner(
+            tags=frozenset(ALLOWED_TAGS),
+            attributes=ALLOWED_ATTRIBUTES,
+            strip=True,
+        )
+    return cleaner
+
 
 def _compact_blank_lines(text: str) -> str:
     """Collapse whitespace-only line runs to a single blank line."""
@@ -44,67 +106,72 @@ def _compact_blank_lines(text: str) -> str:
     if not text:
         return ""
 
-    compacted: List[str] = []
-    blank_open = False
-    for raw_line in text.split("\n"):
-        line = raw_line.replace("\u200b", "").replace("\ufeff", "").replace("\u00a0", " ")
-        if not line.strip():
-            if not blank_open:
-                compacted.append("")
-                blank_open = True
-            continue
-
-        compacted.append(line.rstrip())
-        blank_open = False
-
-    return "\n".join(compacted).strip()
+    # Once trailing whitespace is gone, whitespace-only lines are empty and a run
+    # of them is just three or more consecutive newlines.
+    compacted = _RE_TRAILING_WS.sub("", text.translate(_TRANSLATE_INVISIBLE))
+    return _RE_BLANK_RUN.sub("\n\n", compacted).strip()
 
 
 def _render_markdown(content: str) -> str:
     """Render markdown to sanitized HTML."""
 
-    normalized_content = (content or "").replace("\r\n", "\n").replace("\r", "\n")
+    if not content:
+        return ""
+    return _render_markdown_cached(content)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_markdown_cached(content: str) -> str:
+    """Render non-empty markdown; the output depends only on the content."""
+
+    normalized_content = content.replace("\r\n", "\n").replace("\r", "\n")
     normalized_content = _compact_blank_lines(normalized_content)
+    if not _RE_MARKDOWN_SYNTAX.search(normalized_content):
+        # Plain prose renders to escaped paragraphs, exactly as markdown would.
+        return "\n".join(
+            f"<p>{html.escape(paragraph, quote=False)}</p>"
+            for paragraph in normalized_content.split("\n\n")
+            if paragraph
+        )
 
-    html_content = markdown.markdown(
-        normalized_content,
-        extensions=["extra", "sane_lists"],
-        output_format="html5",
-    )
-    cleaned_html = bleach.clean(
-        html_content,
-        tags=ALLOWED_TAGS,
-        attributes=ALLOWED_ATTRIBUTES,
-        strip=True,
-    )
-    cleaned_html = re.sub(
-        r"<p>(?:\s|&nbsp;|&#160;|<br\s*/?>)*</p>",
-        "",
-        cleaned_html,
-        flags=re.IGNORECASE,
-    )
-    cleaned_html = re.sub(r"(?:<br\s*/?>\s*){2,}", "<br>", cleaned_html, flags=re.IGNORECASE)
+    html_content = _markdown_converter().reset().convert(normalized_content)
+    cleaned_html = _cleaner().clean(html_content)
+    cleaned_html = _RE_EMPTY_PARAGRAPH.sub("", cleaned_html)
+    cleaned_html = _RE_REPEATED_BREAKS.sub("<br>", cleaned_html)
     return cleaned_html.strip()
 
 
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_snippet(text: str) -> str:
+    """Render a source excerpt as escaped text, using markdown only for code fences."""
+
+    if "```" in text:
+        return _render_markdown(text)
+    if len(text) > SNIPPET_MAX_CHARS:
+        text = text[:SNIPPET_MAX_CHARS].rstrip() + "…"
+    return html.escape(text, quote=False).replace("\n", "<br>")
+
+
 def _format_message_html(message: Dict[str, Any]) -> str:
     """Return HTML for a single chat message."""
 
-    role = message.get("role", "assistant")
-    content = _render_markdown(message.get("content", ""))
+    return _message_html(message.get("role", "assistant"), message.get("content", ""))
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _message_html(role: str, raw_content: str) -> str:
+    """Build the chat bubble HTML for a role and raw message content."""
+
+    if role == "user":
+        # The chat input is plain text, so user messages skip markdown entirely.
+        content = html.escape(raw_content, quote=False).replace("\n", "<br>")
+    else:
+        content = _render_markdown(raw_content)
     label = "User" if role == "user" else "Assistant"
     badge = "U" if role == "user" else "AI"
 
-    return (
-        f"<div class='message-row {role}'>"
-        f"  <div class='message-bubble {role}'>"
-        f"    <div class='message-header'>"
-        f"      <span class='role-badge {role}'>{badge}</span>"
-        f"      <span class='role-label'>{label}</span>"
-        f"    </div>"
-        f"    <div class='message-content'>{content}</div>"
-        f"  </div>"
-        f"</div>"
+    return _MESSAGE_TEMPLATE.format_map(
+        {"role": role, "badge": badge, "label": label, "content": content}
     )
 
 
@@ -124,9 +191,9 @@ def render_sources(sources: List[Dict[str, Any]], container: Optional[Any] = Non
     target = container or st
     items = []
     for source in sources:
-        title = source.get("title") or source.get("id") or "Source"
+        title = html.escape(str(source.get("title") or source.get("id") or "Source"))
         score = source.get("score")
-        snippet = _render_markdown(source.get("excerpt") or source.get("content", ""))
+        snippet = _render_snippet(source.get("excerpt") or source.get("content") or "")
         score_text = f"Score: {score:.2f}" if isinstance(score, (int, float)) else ""
         items.append(
             "<div class='source-card'>"
@@ -145,5 +212,10 @@ def render_sources(sources: List[Dict[str, Any]], container: Optional[Any] = Non
 def render_chat_history(messages: List[Dict[str, Any]]) -> None:
     """Render the full conversation history without inline source cards."""
 
-    for message in messages:
-        render_message(message)
+    if not messages:
+        return
+    # One markdown element for the whole history instead of one per message.
+    st.markdown(
+        "".join(_format_message_html(message) for message in messages),
+        unsafe_allow_html=True,
+    )
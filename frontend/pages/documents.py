@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import html
 import os
+import time
+from typing import Any, Dict, List, Tuple
+
 import streamlit as st
 from dotenv import load_dotenv
 
@@ -13,9 +17,32 @@ from utils.view_models import build_document_stats
 load_dotenv()
 
 BACKEND_URL = os.getenv("BACKEND_URL", "https://ragchatbotbackend.azurewebsites.net")
+# Every widget interaction reruns this page, so the listing is reused for a
+# short while; uploads and deletes from this session drop it immediately.
+DOCUMENTS_CACHE_TTL_SECONDS = 30
+
+
+def _get_documents_cached() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Return documents and their stats, reusing a recent listing from this session."""
+
+    cached = st.session_state.get("_docs_cache")
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < DOCUMENTS_CACHE_TTL_SECONDS:
+        return cached[1], cached[2]
+    payload = list_documents(BACKEND_URL)
+    documents = payload.get("documents", [])
+    # Stats are derived from the listing alone, so they are cached alongside it.
+    stats = build_document_stats(
+        documents,
+        file_count=payload.get("file_count"),
+        chunk_count=payload.get("chunk_count"),
+    )
+    st.session_state["_docs_cache"] = (now, documents, stats)
+    return documents, stats
+
 
 st.set_page_config(page_title="Documents · RAG Chatbot", layout="wide")
-inject_global_styles()
+inject_global_styles({"documents"})
 render_sidebar_nav("Documents")
 
 render_page_header(
@@ -30,7 +57,8 @@ file = st.file_uploader(
 if st.button("Upload", type="primary", disabled=file is None):
     try:
         with st.spinner("Uploading document..."):
-            response = upload_document(BACKEND_URL, file.name, file.getvalue())
+            response = upload_document(BACKEND_URL, file.name, file)
+        st.session_state.pop("_docs_cache", None)
         st.success(f"Uploaded {response.get('filename', file.name)}")
     except ApiClientError:
         st.error("Upload failed. Check backend logs and file format.")
@@ -39,23 +67,24 @@ st.divider()
 
 st.subheader("Indexed Coverage")
 try:
-    docs_response = list_documents(BACKEND_URL)
-    documents = docs_response.get("documents", [])
-    stats = build_document_stats(
-        documents,
-        file_count=docs_response.get("file_count"),
-        chunk_count=docs_response.get("chunk_count"),
-    )
+    documents, stats = _get_documents_cached()
 except ApiClientError:
     documents = []
     stats = build_document_stats([])
     st.warning("Unable to fetch documents.")
 
-metric_cols = st.columns(2)
-metric_cols[0].metric("Files", stats["file_count"])
-metric_cols[1].metric("Chunks", stats["chunk_count"])
+# Static blocks are emitted as single HTML elements to keep per-rerun deltas low.
+st.markdown(
+    "<div class='metrics-row'>"
+    f"<div class='metric-card'><div class='doc-meta'>Files</div>"
+    f"<div class='metric-value'>{stats['file_count']}</div></div>"
+    f"<div class='metric-card'><div class='doc-meta'>Chunks</div>"
+    f"<div class='metric-value'>{stats['chunk_count']}</div></div>"
+    "</div>",
+    unsafe_allow_html=True,
+)
 
-if stats["chart_data"]:
+if not stats["chart_data"].empty:
     st.vega_lite_chart(
         stats["chart_data"],
         {
@@ -76,19 +105,38 @@ st.divider()
 st.subheader("Documents")
 
 if documents:
+    rows = []
+    titles_by_id: Dict[str, str] = {}
     for doc in documents:
-        doc_id = doc.get("id") or (doc.get("metadata") or {}).get("id")
+        metadata = doc.get("metadata") or {}
+        doc_id = doc.get("id") or metadata.get("id")
         title = doc.get("title") or doc_id or "Document"
-        chunk_meta = (doc.get("metadata") or {}).get("chunk_count") or 0
-        cols = st.columns([6, 2])
-        cols[0].markdown(
-            f"**{title}**  \nChunks: {chunk_meta}",
+        chunk_meta = metadata.get("chunk_count") or 0
+        if doc_id:
+            titles_by_id[doc_id] = title
+        rows.append(
+            f"<tr><td class='doc-title'>{html.escape(str(title))}</td>"
+            f"<td class='doc-meta'>{chunk_meta}</td></tr>"
         )
-        if doc_id and cols[1].button("Remove", key=f"delete-{doc_id}"):
-            try:
-                delete_document(BACKEND_URL, doc_id)
-                st.success("Deleted document")
-            except ApiClientError:
-                st.error("Delete failed")
+    st.markdown(
+        "<table class='doc-table'><thead><tr><th>Document</th><th>Chunks</th></tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table>",
+        unsafe_allow_html=True,
+    )
+
+    if titles_by_id:
+        with st.form("remove-document"):
+            selected_id = st.selectbox(
+                "Document to remove",
+                list(titles_by_id),
+                format_func=lambda doc_id: f"{titles_by_id[doc_id]} ({doc_id})",
+            )
+            if st.form_submit_button("Remove Selected"):
+                try:
+                    delete_document(BACKEND_URL, selected_id)
+                    st.session_state.pop("_docs_cache", None)
+                    st.success("Deleted document")
+                except ApiClientError:
+                    st.error("Delete failed")
 else:
     st.caption("No documents indexed yet.")
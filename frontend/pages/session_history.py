@@ -10,7 +10,7 @@ from utils.ui import inject_global_styles, render_page_header, render_sidebar_na
 from utils.view_models import build_history_stats
 
 st.set_page_config(page_title="Session History · RAG Chatbot", layout="wide")
-inject_global_styles()
+inject_global_styles({"chat"})
 render_sidebar_nav("Session History")
 initialize_state(st.session_state)
 
@@ -20,7 +20,12 @@ render_page_header(
 )
 
 messages = st.session_state.get("messages", [])
-stats = build_history_stats(messages)
+# History is append-only, so role counts only change when the length does.
+cached_stats = st.session_state.get("_hist_stats_cache")
+if cached_stats is None or cached_stats[0] != len(messages):
+    cached_stats = (len(messages), build_history_stats(messages))
+    st.session_state["_hist_stats_cache"] = cached_stats
+stats = cached_stats[1]
 
 metric_cols = st.columns(3)
 metric_cols[0].metric("Total Messages", stats["total"])
@@ -16,7 +16,7 @@ load_dotenv()
 BACKEND_URL = os.getenv("BACKEND_URL", "https://ragchatbotbackend.azurewebsites.net")
 
 st.set_page_config(page_title="Settings · RAG Chatbot", layout="wide")
-inject_global_styles()
+inject_global_styles(frozenset())
 render_sidebar_nav("Settings")
 initialize_state(st.session_state)
 
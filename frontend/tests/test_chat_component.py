@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
-from frontend.components.chat_component import _format_message_html
+from frontend.components import chat_component
+from frontend.components.chat_component import (
+    _format_message_html,
+    _render_markdown,
+    _render_markdown_cached,
+    _render_snippet,
+)
 
 
 def test_markdown_bold_rendering() -> None:
@@ -30,6 +36,23 @@ def test_message_wrapper_classes() -> None:
     assert "message-bubble user" in html
 
 
+def test_user_messages_render_as_escaped_text() -> None:
+    """User input is plain text: markup is escaped and newlines become breaks."""
+
+    html = _format_message_html({"role": "user", "content": "<script>x</script>\n**hi**"})
+    assert "&lt;script&gt;x&lt;/script&gt;<br>**hi**" in html
+    assert "<strong>" not in html
+
+
+def test_source_snippets_are_escaped_and_truncated() -> None:
+    """Source excerpts render as escaped text capped at the snippet length."""
+
+    snippet = _render_snippet("<b>x</b>\n" + "y" * 500)
+    assert snippet.startswith("&lt;b&gt;x&lt;/b&gt;<br>")
+    assert snippet.endswith("…")
+    assert len(snippet) < 450
+
+
 def test_markdown_table_rendering_preserved() -> None:
     """Ensure markdown tables render into HTML table tags."""
 
@@ -57,3 +80,25 @@ def test_nbsp_only_lines_do_not_create_gaps() -> None:
     html = _format_message_html({"role": "assistant", "content": content})
     assert "<h3>Scope</h3>" in html
     assert "&nbsp;" not in html
+
+
+def test_repeated_content_reuses_rendered_html() -> None:
+    """Re-rendering unchanged history should hit the markdown cache."""
+
+    first = _render_markdown("Cached **history** entry")
+    hits = _render_markdown_cached.cache_info().hits
+    assert _render_markdown("Cached **history** entry") == first
+    assert _render_markdown_cached.cache_info().hits == hits + 1
+
+
+def test_chat_history_renders_in_one_element(monkeypatch) -> None:
+    """The whole history should be emitted with a single markdown call."""
+
+    calls = []
+    monkeypatch.setattr(chat_component.st, "markdown", lambda body, **_kwargs: calls.append(body))
+    chat_component.render_chat_history(
+        [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+    )
+    chat_component.render_chat_history([])
+    assert len(calls) == 1
+    assert calls[0].count("message-row") == 2
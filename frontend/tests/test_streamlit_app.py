@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import io
 from unittest.mock import MagicMock
-import requests
 
+import orjson
 import pytest
+from requests.models import RequestEncodingMixin
 
 from frontend.utils.api_client import (
+    _SESSION,
     ApiClientError,
     check_health,
     send_chat_message,
@@ -21,8 +24,8 @@ def test_api_client_connection(monkeypatch):
     """Verify backend connectivity check."""
 
     fake_response = MagicMock(ok=True)
-    fake_response.json.return_value = {"status": "ok"}
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: fake_response)
+    fake_response.content = orjson.dumps({"status": "ok"})
+    monkeypatch.setattr(_SESSION, "get", lambda *args, **kwargs: fake_response)
 
     result = check_health("https://ragchatbotbackend.azurewebsites.net")
     assert result["status"] == "ok"
@@ -32,8 +35,8 @@ def test_message_sending(monkeypatch):
     """Simulate sending a chat message."""
 
     fake_response = MagicMock(ok=True)
-    fake_response.json.return_value = {"answer": "Hi", "sources": [], "tokens_used": 5}
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: fake_response)
+    fake_response.content = orjson.dumps({"answer": "Hi", "sources": [], "tokens_used": 5})
+    monkeypatch.setattr(_SESSION, "post", lambda *args, **kwargs: fake_response)
 
     answer, sources, tokens, has_context, actions = send_chat_message(
         "https://ragchatbotbackend.azurewebsites.net", "hello", [], 0.2, 512
@@ -48,14 +51,16 @@ def test_message_sending_insufficient_context(monkeypatch):
     """Ensure no-context payload is propagated correctly by API client."""
 
     fake_response = MagicMock(ok=True)
-    fake_response.json.return_value = {
-        "answer": "I don't have enough information in the knowledge base to answer this question.",
-        "sources": [],
-        "tokens_used": 3,
-        "has_sufficient_context": False,
-        "suggested_actions": ["Upload relevant documents"],
-    }
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: fake_response)
+    fake_response.content = orjson.dumps(
+        {
+            "answer": "I don't have enough information in the knowledge base to answer this question.",
+            "sources": [],
+            "tokens_used": 3,
+            "has_sufficient_context": False,
+            "suggested_actions": ["Upload relevant documents"],
+        }
+    )
+    monkeypatch.setattr(_SESSION, "post", lambda *args, **kwargs: fake_response)
 
     answer, sources, tokens, has_context, actions = send_chat_message(
         "https://ragchatbotbackend.azurewebsites.net", "unknown", [], 0.2, 512
@@ -71,13 +76,43 @@ def test_document_upload(monkeypatch):
     """Test file upload flow."""
 
     fake_response = MagicMock(ok=True)
-    fake_response.json.return_value = {"message": "Document uploaded"}
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: fake_response)
+    fake_response.content = orjson.dumps({"message": "Document uploaded"})
+    monkeypatch.setattr(_SESSION, "post", lambda *args, **kwargs: fake_response)
 
     result = upload_document("https://ragchatbotbackend.azurewebsites.net", "test.txt", b"hello")
     assert result["message"] == "Document uploaded"
 
 
+def test_document_upload_streams_whole_file(monkeypatch):
+    """Ensure the streamed body matches requests' multipart encoding of the full file."""
+
+    content = b"first line\nsecond line\n" * 5000
+    uploaded = io.BytesIO(content)
+    uploaded.read()  # Already consumed, as after a preview on an earlier rerun.
+
+    captured = {}
+    fake_response = MagicMock(ok=True)
+    fake_response.content = orjson.dumps({"message": "Document uploaded"})
+
+    def fake_post(url, data=None, headers=None, **kwargs):
+        captured["length"] = len(data)
+        captured["body"] = b"".join(data)
+        captured["content_type"] = headers["Content-Type"]
+        return fake_response
+
+    monkeypatch.setattr(_SESSION, "post", fake_post)
+    upload_document("https://ragchatbotbackend.azurewebsites.net", "notes.txt", uploaded)
+
+    boundary = captured["content_type"].split("boundary=", 1)[1]
+    expected, expected_type = RequestEncodingMixin._encode_files(
+        {"file": ("notes.txt", content, "application/octet-stream")}, None
+    )
+    expected_boundary = expected_type.split("boundary=", 1)[1]
+    assert captured["content_type"] == f"multipart/form-data; boundary={boundary}"
+    assert captured["body"] == expected.replace(expected_boundary.encode(), boundary.encode())
+    assert captured["length"] == len(captured["body"])
+
+
 def test_settings_update():
     """Verify settings changes persist in state."""
 
@@ -95,7 +130,7 @@ def test_error_handling(monkeypatch):
 
     fake_response = MagicMock(ok=False)
     fake_response.text = "backend down"
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: fake_response)
+    monkeypatch.setattr(_SESSION, "get", lambda *args, **kwargs: fake_response)
 
     with pytest.raises(ApiClientError):
         check_health("https://ragchatbotbackend.azurewebsites.net")
@@ -107,7 +142,7 @@ def test_error_handling_prefers_detail_message(monkeypatch):
     fake_response = MagicMock(ok=False)
     fake_response.text = "raw error"
     fake_response.json.return_value = {"detail": "Cannot reach Azure Search"}
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: fake_response)
+    monkeypatch.setattr(_SESSION, "get", lambda *args, **kwargs: fake_response)
 
     with pytest.raises(ApiClientError, match="Cannot reach Azure Search"):
         check_health("https://ragchatbotbackend.azurewebsites.net")
@@ -119,10 +154,10 @@ def test_streaming_response(monkeypatch):
     class FakeResponse:
         ok = True
 
-        def iter_lines(self, decode_unicode=True):
-            return iter(["data: Hel", "data: lo", "data:  world", ""])
+        def iter_content(self, chunk_size=None):
+            return iter([b"data: Hel\n\nda", b"ta: lo\r\n\ndata:  world\n\n", b"data: [DONE]"])
 
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: FakeResponse())
+    monkeypatch.setattr(_SESSION, "post", lambda *args, **kwargs: FakeResponse())
 
     chunks = list(
         stream_chat_message("https://ragchatbotbackend.azurewebsites.net", "hi", [], 0.2, 512, 5)
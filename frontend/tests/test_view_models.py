@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import pandas as pd
+
 from frontend.utils.view_models import build_document_stats, build_history_stats
 
 
@@ -15,7 +17,8 @@ def test_build_document_stats_defaults() -> None:
     stats = build_document_stats(docs)
     assert stats["file_count"] == 2
     assert stats["chunk_count"] == 5
-    assert stats["chart_data"][0]["title"] == "A"
+    assert stats["chart_data"]["title"].tolist() == ["A", "B"]
+    assert stats["chart_data"]["chunk_count"].tolist() == [2, 3]
 
 
 def test_build_document_stats_override_counts() -> None:
@@ -27,6 +30,45 @@ def test_build_document_stats_override_counts() -> None:
     assert stats["chunk_count"] == 99
 
 
+def test_build_document_stats_metrics_only_skips_documents() -> None:
+    """Ensure metrics-only calls with known totals never touch the documents."""
+
+    def docs():
+        raise AssertionError("documents should not be iterated")
+        yield
+
+    stats = build_document_stats(docs(), file_count=4, chunk_count=9, include_chart=False)
+    assert stats["file_count"] == 4
+    assert stats["chunk_count"] == 9
+    assert stats["chart_data"].empty
+
+
+def test_build_document_stats_consumes_iterators_once() -> None:
+    """Ensure a one-shot iterable still yields counts and chart rows."""
+
+    docs = iter([{"id": "a", "metadata": {"chunk_count": 4}}, {"title": "B"}])
+    stats = build_document_stats(docs)
+    assert stats["file_count"] == 2
+    assert stats["chunk_count"] == 4
+    assert stats["chart_data"]["title"].tolist() == ["a", "B"]
+
+
+def test_build_document_stats_dataframe_input() -> None:
+    """Ensure DataFrame input matches the row-based fallbacks."""
+
+    frame = pd.DataFrame(
+        [
+            {"title": "A", "metadata": {"chunk_count": 2}},
+            {"title": "", "id": "b", "metadata": None},
+            {"metadata": {"chunk_count": 5}},
+        ]
+    )
+    stats = build_document_stats(frame)
+    assert stats["file_count"] == 3
+    assert stats["chunk_count"] == 7
+    assert stats["chart_data"]["title"].tolist() == ["A", "b", "Document"]
+
+
 def test_build_history_stats() -> None:
     """Ensure history stats count roles correctly."""
 
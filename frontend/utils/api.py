@@ -2,7 +2,7 @@
 
 from typing import Any, Dict, List, Tuple
 
-import requests
+from .api_client import _SESSION
 
 
 def send_chat(
@@ -18,7 +18,7 @@ def send_chat(
         "history": history,
         "top_k": top_k,
     }
-    response = requests.post(f"{backend_url}/api/chat", json=payload, timeout=60)
+    response = _SESSION.post(f"{backend_url}/api/chat", json=payload, timeout=60)
     response.raise_for_status()
     data = response.json()
     return data.get("answer", ""), data.get("sources", [])
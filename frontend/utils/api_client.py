@@ -2,13 +2,33 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Generator, List, Tuple
+import io
+import os
+import uuid
+from typing import Any, BinaryIO, Dict, Generator, Iterator, List, Tuple
 
+import orjson
 import requests
-
-
+from requests.adapters import HTTPAdapter
+from urllib3.fields import RequestField
+
+# Streamlit reruns the script on every interaction; one shared session keeps
+# keep-alive connections to the backend pooled across calls and reruns.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
 class ApiClientError(RuntimeError):
     """Raised when an API call fails."""
+
+
+def _json_body(response: requests.Response) -> Any:
+    """Decode a successful JSON response body with orjson."""
+
+    return orjson.loads(response.content)
 
 
 def _extract_error_detail(response: requests.Response) -> str:
@@ -47,10 +67,15 @@ def send_chat_message(
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
-    response = requests.post(f"{backend_url}/api/chat", json=payload, timeout=60)
+    response = _SESSION.post(
+        f"{backend_url}/api/chat",
+        data=orjson.dumps(payload),
+        headers=_JSON_HEADERS,
+        timeout=60,
+    )
     if not response.ok:
         raise ApiClientError(_extract_error_detail(response))
-    data = response.json()
+    data = _json_body(response)
     return (
         data.get("answer", ""),
         data.get("sources", []),
@@ -77,60 +102,151 @@ def stream_chat_message(
         "temperature": temperature,
         "max_tokens": max_tokens,
     }
-    response = requests.post(
-        f"{backend_url}/api/chat/stream", json=payload, stream=True, timeout=60
+    response = _SESSION.post(
+        f"{backend_url}/api/chat/stream",
+        data=orjson.dumps(payload),
+        headers=_JSON_HEADERS,
+        stream=True,
+        timeout=60,
     )
     if not response.ok:
         raise ApiClientError(_extract_error_detail(response))
 
-    for line in response.iter_lines(decode_unicode=True):
-        if not line:
+    for payload in _iter_sse_data(response):
+        if payload == b"[DONE]":
             continue
-        if line.startswith("data:"):
-            chunk = line[len("data:"):]
-            if chunk.startswith(" "):
-                chunk = chunk[1:]
-            if chunk == "[DONE]":
-                continue
-            yield chunk
+        yield payload.decode("utf-8")
 
 
-def upload_document(backend_url: str, filename: str, file_bytes: bytes) -> Dict[str, Any]:
+def _iter_sse_data(response: requests.Response) -> Generator[bytes, None, None]:
+    """Yield raw ``data:`` payloads from an SSE byte stream."""
+
+    # Lines are split on bytes so only the payload is ever decoded; a multi-byte
+    # character cannot straddle a newline, so per-line decoding stays valid.
+    buffer = bytearray()
+    for block in response.iter_content(chunk_size=4096):
+        if not block:
+            continue
+        buffer += block
+        start = 0
+        end = buffer.find(b"\n")
+        while end != -1:
+            payload = _sse_payload(memoryview(buffer)[start:end])
+            if payload is not None:
+                yield payload
+            start = end + 1
+            end = buffer.find(b"\n", start)
+        del buffer[:start]
+    if buffer:
+        payload = _sse_payload(memoryview(buffer))
+        if payload is not None:
+            yield payload
+
+
+def _sse_payload(line: memoryview) -> bytes | None:
+    """Return the payload of a ``data:`` line, or None for any other line."""
+
+    # Everything is checked on the view; only a data payload is ever copied.
+    if line[:5] != b"data:":
+        return None
+    payload = line[5:]
+    if payload[-1:] == b"\r":
+        payload = payload[:-1]
+    if payload[:1] == b" ":
+        payload = payload[1:]
+    return payload.tobytes()
+
+
+UPLOAD_READ_SIZE = 64 * 1024
+
+
+class _MultipartFileBody:
+    """Streaming multipart/form-data body holding a single file field."""
+
+    def __init__(self, field_name: str, filename: str, file_obj: BinaryIO) -> None:
+        boundary = uuid.uuid4().hex
+        field = RequestField(name=field_name, data=b"", filename=filename)
+        field.make_multipart(content_type="application/octet-stream")
+        head = f"--{boundary}\r\n".encode() + field.render_headers().encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+
+        # Send the whole file even if it was already read, e.g. by a preview on rerun.
+        file_size = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(0)
+
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._length = len(head) + file_size + len(tail)
+        self._parts: List[BinaryIO] = [io.BytesIO(head), file_obj, io.BytesIO(tail)]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            block = self.read(UPLOAD_READ_SIZE)
+            if not block:
+                return
+            yield block
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes of the encoded body (all when negative)."""
+
+        blocks = []
+        while self._parts and size != 0:
+            block = self._parts[0].read(size)
+            if not block:
+                self._parts.pop(0)
+                continue
+            blocks.append(block)
+            if size > 0:
+                size -= len(block)
+        return b"".join(blocks)
+
+
+def upload_document(
+    backend_url: str, filename: str, file: BinaryIO | bytes
+) -> Dict[str, Any]:
     """Upload a document for indexing."""
 
-    files = {"file": (filename, file_bytes)}
-    response = requests.post(
-        f"{backend_url}/api/documents/upload", files=files, timeout=120
+    # The body is read from the file object as it is sent instead of being
+    # encoded into one in-memory copy of the whole upload first.
+    file_obj = io.BytesIO(file) if isinstance(file, (bytes, bytearray)) else file
+    body = _MultipartFileBody("file", filename, file_obj)
+    response = _SESSION.post(
+        f"{backend_url}/api/documents/upload",
+        data=body,
+        headers={"Content-Type": body.content_type},
+        timeout=120,
     )
     if not response.ok:
         raise ApiClientError(_extract_error_detail(response))
-    return response.json()
+    return _json_body(response)
 
 
 def list_documents(backend_url: str) -> Dict[str, Any]:
     """List documents from the backend index."""
 
-    response = requests.get(f"{backend_url}/api/documents", timeout=60)
+    response = _SESSION.get(f"{backend_url}/api/documents", timeout=60)
     if not response.ok:
         raise ApiClientError(_extract_error_detail(response))
-    return response.json()
+    return _json_body(response)
 
 
 def delete_document(backend_url: str, document_id: str) -> Dict[str, Any]:
     """Delete a document by ID."""
 
-    response = requests.delete(
+    response = _SESSION.delete(
         f"{backend_url}/api/documents/{document_id}", timeout=60
     )
     if not response.ok:
         raise ApiClientError(_extract_error_detail(response))
-    return response.json()
+    return _json_body(response)
 
 
 def check_health(backend_url: str) -> Dict[str, Any]:
     """Check backend health status."""
 
-    response = requests.get(f"{backend_url}/api/health", timeout=30)
+    response = _SESSION.get(f"{backend_url}/api/health", timeout=30)
     if not response.ok:
         raise ApiClientError(_extract_error_detail(response))
-    return response.json()
+    return _json_body(response)
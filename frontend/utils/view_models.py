@@ -2,26 +2,45 @@
 
 from __future__ import annotations
 
+from collections import Counter
 from typing import Any, Dict, Iterable, List, Tuple
 
+import numpy as np
+import pandas as pd
+
 
 def build_document_stats(
-    documents: Iterable[Dict[str, Any]],
+    documents: Iterable[Dict[str, Any]] | pd.DataFrame,
     file_count: int | None = None,
     chunk_count: int | None = None,
+    include_chart: bool = True,
 ) -> Dict[str, Any]:
     """Build document metrics and chart data."""
 
-    docs = list(documents)
-    derived_file_count = file_count if file_count is not None else len(docs)
+    if not include_chart and file_count is not None and chunk_count is not None:
+        # Metrics-only callers that already have both totals need no pass at all.
+        return {
+            "file_count": file_count,
+            "chunk_count": chunk_count,
+            "chart_data": pd.DataFrame({"title": [], "chunk_count": []}),
+        }
 
-    chart_data: List[Dict[str, Any]] = []
-    derived_chunk_total = 0
-    for doc in docs:
-        title = doc.get("title") or doc.get("id") or "Document"
-        chunk_total = (doc.get("metadata") or {}).get("chunk_count") or 0
-        derived_chunk_total += chunk_total
-        chart_data.append({"title": title, "chunk_count": chunk_total})
+    if isinstance(documents, pd.DataFrame):
+        titles, counts = _frame_chart_columns(documents)
+    else:
+        # One pass over the iterable builds both chart columns, so it is never
+        # copied into a list first; the file count falls back to the rows seen.
+        title_list: List[str] = []
+        chunk_counts: List[int] = []
+        for doc in documents:
+            title_list.append(doc.get("title") or doc.get("id") or "Document")
+            chunk_counts.append((doc.get("metadata") or {}).get("chunk_count") or 0)
+        titles = title_list
+        counts = np.asarray(chunk_counts, dtype=np.int64)
+    # Streamlit ships the DataFrame as Arrow instead of per-row JSON.
+    chart_data = pd.DataFrame({"title": titles, "chunk_count": counts})
+    derived_file_count = file_count if file_count is not None else len(counts)
+    derived_chunk_total = int(counts.sum())
 
     derived_chunk_count = chunk_count if chunk_count is not None else derived_chunk_total
 
@@ -32,22 +51,36 @@ def build_document_stats(
     }
 
 
+def _frame_chart_columns(frame: pd.DataFrame) -> Tuple[List[str], np.ndarray]:
+    """Return chart titles and chunk counts for documents held in a DataFrame."""
+
+    # Same fallbacks as the row path: missing or empty titles use the id, then
+    # the "Document" placeholder; missing or null chunk counts count as 0.
+    titles = pd.Series("Document", index=frame.index, dtype=object)
+    for column in ("id", "title"):
+        if column in frame:
+            values = frame[column]
+            present = values.notna() & (values != "")
+            titles = values.where(present, titles)
+
+    if "metadata" in frame:
+        counts = frame["metadata"].map(
+            lambda metadata: (metadata.get("chunk_count") or 0)
+            if isinstance(metadata, dict)
+            else 0
+        )
+        chunk_counts = counts.fillna(0).to_numpy(dtype=np.int64)
+    else:
+        chunk_counts = np.zeros(len(frame), dtype=np.int64)
+    return titles.tolist(), chunk_counts
+
+
 def build_history_stats(messages: Iterable[Dict[str, Any]]) -> Dict[str, int]:
     """Return counts for session history metrics."""
 
-    total = 0
-    user_count = 0
-    assistant_count = 0
-    for message in messages:
-        total += 1
-        role = message.get("role")
-        if role == "user":
-            user_count += 1
-        elif role == "assistant":
-            assistant_count += 1
-
+    role_counts = Counter(message.get("role") for message in messages)
     return {
-        "total": total,
-        "user": user_count,
-        "assistant": assistant_count,
+        "total": sum(role_counts.values()),
+        "user": role_counts["user"],
+        "assistant": role_counts["assistant"],
     }